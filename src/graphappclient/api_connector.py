@@ -1,8 +1,22 @@
-from graphappclient.constants import (ACCESS_TOKEN, DEFAULT_SCOPE, ERROR, LOGIN_AUTH_URL)
+from collections import OrderedDict, deque
+from graphappclient.constants import (ACCESS_TOKEN, API_VERSION, DEFAULT_SCOPE,
+                                    DEFAULT_STALE_CACHE_SIZE, DEFAULT_TIMEOUT,
+                                    ERROR, LATENCY_SAMPLE_SIZE, LOGIN_AUTH_URL,
+                                    MIN_HEDGE_DELAY, MIN_HEDGE_SAMPLES)
+from http import HTTPStatus
+import json
 import logging
-from msal import ConfidentialClientApplication
-import requests
-from requests import Response
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+# msal and requests are slow to import, so they are only imported once the
+# first call is made, keeping startup fast for short lived processes
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    from msal import ConfidentialClientApplication
+    from requests import Response, Session
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -15,14 +29,43 @@ class APIConnector:
     Microsoft.
 
     Attributes
+        client_id(str): Client ID of application registered in Azure
+        tenant_id(str): Tenant ID of application registered in Azure
         msal_app(ConfidentialClientApplication): The MSAL object that is used
-            to get and manage auth tokens with the Graph API
+            to get and manage auth tokens with the Graph API, created on first
+            use
+        session(Session): HTTP session whose connection pool is used for all
+            calls, both to the Graph API and for tokens, created on first use
+        rate_budget(Any): Optional rate limiter, its acquire() is called before
+            every Graph API call
+        timeout(float): Seconds to wait on a Graph API call
+        endpoint_timeouts(dict): Timeouts for endpoints by path prefix, such as
+            {'/users': 5}, overriding timeout
+        circuit_breaker(Any): Optional CircuitBreaker that fast-fails calls to
+            failing endpoints
+        serve_stale(bool): Whether the last successful response of a GET is
+            served when its endpoint is failing
+        hedge_gets(bool): Whether a second GET is sent when the first is slower
+            than the endpoint's 95th percentile latency
     """
 
-    def __init__(self, client_id: str, tenant_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str,
+        session: Optional['Session'] = None,
+        rate_budget: Optional[Any] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = DEFAULT_TIMEOUT,
+        endpoint_timeouts: Optional[dict] = None,
+        circuit_breaker: Optional[Any] = None,
+        serve_stale: bool = False,
+        hedge_gets: bool = False
+    ):
         """
         Initializes an APIConnector object. This class will handle managing
-        auth tokens as well as making the HTTP requests to the Graph API
+        auth tokens as well as making the HTTP requests to the Graph API. The
+        MSAL app and HTTP session aren't created until they are first needed
 
         Parameters
             client_id : str
@@ -31,17 +74,87 @@ class APIConnector:
                 Tenant ID of application registered in Azure
             client_secret : str
                 Client secret value of application registered in Azure
+            session : Optional[Session]
+                HTTP session to make calls with, can be shared between
+                connectors to share its connection pool. A new one is created
+                if not provided
+            rate_budget : Optional[Any]
+                Rate limiter with an acquire() method, such as a RateBudget,
+                called before every Graph API call
+            timeout : Optional[Union[float, Tuple[float, float]]]
+                Seconds to wait on a Graph API call, or a (connect, read)
+                tuple. None waits forever
+            endpoint_timeouts : Optional[dict]
+                Timeouts for endpoints by path prefix, the longest matching
+                prefix is used
+            circuit_breaker : Optional[Any]
+                CircuitBreaker that fast-fails calls to failing endpoints with
+                a 503 response
+            serve_stale : bool
+                If True, the last successful response of a GET is served when
+                its endpoint is failing or its circuit is open
+            hedge_gets : bool
+                If True, a second GET is sent when the first is slower than
+                the endpoint's 95th percentile latency, and the first response
+                to arrive is used
         """
 
+        self.client_id = client_id
+        self.tenant_id = tenant_id
+        self._client_secret = client_secret
+
+        # HTTP session, keeps connections alive between calls
+        self._session = session
+        self.rate_budget = rate_budget
+
+        # Tail latency control
+        self.timeout = timeout
+        self.endpoint_timeouts = endpoint_timeouts or {}
+        self.circuit_breaker = circuit_breaker
+        self.serve_stale = serve_stale
+        self.hedge_gets = hedge_gets
+        self._stale_responses = OrderedDict()
+        self._latencies = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
         # MSAL object for managing access tokens
-        self.msal_app = ConfidentialClientApplication(
-            client_id,
-            authority=f'{LOGIN_AUTH_URL}{tenant_id}',
-            client_credential=client_secret
-        )
+        self._msal_app = None
 
         self._access_token = None
 
+    @property
+    def session(self) -> 'Session':
+        """
+        HTTP session used for all calls, created on first use
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    self._session = requests.Session()
+        return self._session
+
+    @property
+    def msal_app(self) -> 'ConfidentialClientApplication':
+        """
+        MSAL object used to get and manage auth tokens, created on first use as
+        creating it makes a network call to discover the tenant
+        """
+        if self._msal_app is None:
+            session = self.session
+            with self._lock:
+                if self._msal_app is None:
+                    from msal import ConfidentialClientApplication
+                    self._msal_app = ConfidentialClientApplication(
+                        self.client_id,
+                        authority=f'{LOGIN_AUTH_URL}{self.tenant_id}',
+                        client_credential=self._client_secret,
+                        http_client=session,
+                        timeout=self.timeout
+                    )
+        return self._msal_app
+
     def authenticate(self) -> bool:
         """
         Authenticates the GraphAppClient with Microsoft in order to make calls
@@ -107,20 +220,277 @@ class APIConnector:
         headers = {'Authorization': 'Bearer ' + token}
         return headers
     
-    def get(self, url: str) -> Response:
+    def _request(self, method: str, url: str, headers: dict=None,
+                json: dict=None, data: Any=None, stream: bool=False,
+                authenticate: bool=True) -> 'Response':
         """
-        Used for making GET API calls to MS Graph
+        Makes an authenticated HTTP call to MS Graph with the session, waiting
+        on the rate budget first if there is one. If the endpoint's circuit is
+        open the call isn't made, and a stale or 503 response is returned.
+
+        Parameters
+            method : str
+                HTTP method of the call
+            url : str
+                URL endpoint of the call
+            headers : Union[dict, None]
+                Extra headers to be sent with the call
+            json : Union[dict, None]
+                JSON to be sent in call
+            data : Any
+                Raw body to be sent in call, such as bytes or a memoryview
+            stream : bool
+                If True, the body of the response is read as it is consumed
+                instead of up front. Streamed responses are never hedged or
+                served stale
+            authenticate : bool
+                If False, no auth token is sent, for pre-authenticated URLs
+                such as upload sessions and download URLs
+        """
+        from requests import RequestException
+
+        key, timeout = self._endpoint_settings(url)
+        is_get = method == 'GET' and not stream
+
+        # Checking for open circuit
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow(key):
+            logger.warning(f'Circuit open for endpoint {key}, not calling {url}')
+            stale = self._get_stale(url) if is_get else None
+            return stale if stale is not None else self._unavailable_response(url)
+
+        # Anything failing before an outcome is recorded, such as getting the
+        # token, counts as a failure so a trial call can't leave the circuit
+        # half open
+        recorded = False
+        try:
+            if self.rate_budget is not None:
+                self.rate_budget.acquire()
+
+            # Get auth token for call
+            headers = dict(headers or {})
+            if authenticate:
+                headers.update(self._get_headers())
+
+            start = time.monotonic()
+            try:
+                if is_get and self.hedge_gets:
+                    response = self._hedged_get(key, url, headers, timeout)
+                else:
+                    response = self.session.request(method, url, json=json,
+                                                data=data, headers=headers,
+                                                timeout=timeout, stream=stream)
+            except RequestException:
+                recorded = True
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure(key)
+                stale = self._get_stale(url) if is_get else None
+                if stale is None:
+                    raise
+                logger.warning(f'Call to {url} failed, serving stale response')
+                return stale
+            latency = time.monotonic() - start
+
+            if (response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+                    or response.status_code == HTTPStatus.TOO_MANY_REQUESTS):
+                recorded = True
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure(key)
+                stale = self._get_stale(url) if is_get else None
+                if stale is not None:
+                    logger.warning(f'Call to {url} failed, serving stale response')
+                    return stale
+                return response
+
+            recorded = True
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success(key, latency)
+            self._record_latency(key, latency)
+            if is_get and self.serve_stale and response.status_code == HTTPStatus.OK:
+                self._put_stale(url, response)
+
+            return response
+        finally:
+            if not recorded and self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure(key)
+
+    def _hedged_get(self, key: str, url: str, headers: dict,
+                    timeout: Any) -> 'Response':
+        """
+        Makes a GET call, and makes it a second time if the first hasn't
+        returned after the endpoint's 95th percentile latency. The first
+        successful response is returned.
 
         Parameters
+            key : str
+                Endpoint key of the call
             url : str
                 URL endpoint to GET from
+            headers : dict
+                Headers to be sent with the call
+            timeout : Any
+                Timeout for the call
         """
-        # Get auth token for call
-        headers = self._get_headers()
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        delay = self._hedge_delay(key)
+        if delay is None: # Not enough samples yet
+            return self.session.request('GET', url, headers=headers,
+                                        timeout=timeout)
+
+        executor = self._get_executor()
+        futures = [executor.submit(self.session.request, 'GET', url,
+                                    headers=headers, timeout=timeout)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            logger.info(f'Hedging GET to {url} after {delay:.3f}s')
+            if self.rate_budget is not None:
+                self.rate_budget.acquire()
+            futures.append(executor.submit(self.session.request, 'GET', url,
+                                            headers=headers, timeout=timeout))
+
+        # Taking the first response, falling back to the other if it raised
+        pending = futures
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None or not pending:
+                break
+
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(self._close_response)
+
+        if winner is None:
+            return next(iter(done)).result() # raises the exception
+
+        return winner.result()
+
+    def _endpoint_settings(self, url: str) -> Tuple[str, Any]:
+        """
+        Gets the endpoint key used for circuit breaking and latency tracking,
+        and the timeout for a URL
+
+        Parameters
+            url : str
+                URL endpoint of the call
+
+        Returns
+            Tuple[str, Any]:
+                Endpoint key, such as '/users', and timeout
+        """
+        path = urlparse(url).path
+        version_prefix = f'/{API_VERSION}'
+        if path.startswith(version_prefix):
+            path = path[len(version_prefix):]
+
+        key = '/' + path.strip('/').split('/', 1)[0]
+
+        timeout = self.timeout
+        match_length = -1
+        for prefix, prefix_timeout in self.endpoint_timeouts.items():
+            if path.startswith(prefix) and len(prefix) > match_length:
+                timeout = prefix_timeout
+                match_length = len(prefix)
 
-        return requests.get(url, headers=headers)
+        return key, timeout
+
+    def _record_latency(self, key: str, latency: float):
+        with self._lock:
+            if key not in self._latencies:
+                self._latencies[key] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+            self._latencies[key].append(latency)
+
+    def _hedge_delay(self, key: str) -> Union[float, None]:
+        """
+        Gets the delay before a hedged GET is sent for an endpoint
+
+        Parameters
+            key : str
+                Endpoint key
+
+        Returns
+            Union[float, None]:
+                95th percentile latency of the endpoint, or None if there are
+                too few samples to tell
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return max(p95, MIN_HEDGE_DELAY)
+
+    def _get_executor(self) -> 'ThreadPoolExecutor':
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix='graphappclient-hedge'
+                )
+            return self._executor
+
+    def _get_stale(self, url: str) -> Union['Response', None]:
+        if not self.serve_stale:
+            return None
+
+        with self._lock:
+            return self._stale_responses.get(url)
+
+    def _put_stale(self, url: str, response: 'Response'):
+        with self._lock:
+            self._stale_responses[url] = response
+            self._stale_responses.move_to_end(url)
+            if len(self._stale_responses) > DEFAULT_STALE_CACHE_SIZE:
+                self._stale_responses.popitem(last=False)
+
+    @staticmethod
+    def _close_response(future):
+        if future.exception() is None:
+            future.result().close()
+
+    @staticmethod
+    def _unavailable_response(url: str) -> 'Response':
+        """
+        Builds the response returned for calls fast-failed by the circuit
+        breaker, shaped like a Graph API error
+
+        Parameters
+            url : str
+                URL endpoint of the call
+        """
+        from requests import Response
+
+        response = Response()
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+        response.url = url
+        response._content = json.dumps({ERROR: {
+            'code': 'circuitOpen',
+            'message': 'Call not made, the endpoint has been failing'
+        }}).encode()
+        return response
+
+    def get(self, url: str, headers: dict=None, stream: bool=False,
+            authenticate: bool=True) -> 'Response':
+        """
+        Used for making GET API calls to MS Graph
+
+        Parameters
+            url : str
+                URL endpoint to GET from
+            headers : Union[dict, None]
+                Extra headers to be sent with the call
+            stream : bool
+                If True, the body is read as it is consumed, for downloads
+            authenticate : bool
+                If False, no auth token is sent, for pre-authenticated URLs
+        """
+        return self._request('GET', url, headers=headers, stream=stream,
+                            authenticate=authenticate)
     
-    def post(self, url: str, json: dict=None) -> Response:
+    def post(self, url: str, json: dict=None) -> 'Response':
         """
         Used for making POST API calls to MS Graph
 
@@ -130,12 +500,30 @@ class APIConnector:
             data : Union[dict, None]
                 JSON to be sent in POST
         """
-        # Get auth token for call
-        headers = self._get_headers()
-
-        return requests.post(url, json=json, headers=headers)
+        return self._request('POST', url, json=json)
     
-    def delete(self, url: str, json: dict=None) -> Response:
+    def put(self, url: str, data: Any=None, headers: dict=None,
+            authenticate: bool=True) -> 'Response':
+        """
+        Used for making PUT API calls to MS Graph, such as uploading file
+        content
+
+        Parameters
+            url : str
+                URL endpoint to PUT to
+            data : Any
+                Raw body to be sent in call, such as bytes or a memoryview
+            headers : Union[dict, None]
+                Extra headers to be sent with the call
+            authenticate : bool
+                If False, no auth token is sent, for pre-authenticated URLs
+                such as upload sessions
+        """
+        return self._request('PUT', url, headers=headers, data=data,
+                            authenticate=authenticate)
+
+    def delete(self, url: str, json: dict=None,
+                authenticate: bool=True) -> 'Response':
         """
         Used for making delete API calls to MS Graph
 
@@ -144,13 +532,13 @@ class APIConnector:
                 URL endpoint to GET from
             data : Union[dict, None]
                 JSON to be sent in call
+            authenticate : bool
+                If False, no auth token is sent, for pre-authenticated URLs
         """
-        # Get auth token for call
-        headers = self._get_headers()
-
-        return requests.delete(url, json=json, headers=headers)
+        return self._request('DELETE', url, json=json,
+                            authenticate=authenticate)
 
-    def patch(self, url: str, json: dict=None) -> Response:
+    def patch(self, url: str, json: dict=None) -> 'Response':
         """
         Used for making PATCH API calls to MS Graph
 
@@ -160,7 +548,4 @@ class APIConnector:
             data : Union[dict, None]
                 JSON to be sent in call
         """
-        # Get auth token for call
-        headers = self._get_headers()
-
-        return requests.patch(url, json=json, headers=headers)
+        return self._request('PATCH', url, json=json)
@@ -10,13 +10,74 @@ DEFAULT_SCOPE = ['https://graph.microsoft.com/.default']
 
 # Query Param Strings
 TOP_QUERY = '$top='
+COUNT_QUERY = '$count=true'
 DEFAULT_USER_SELECT = '$select=businessPhones,displayName,givenName,jobTitle,mail,mobilePhone,officeLocation,preferredLanguage,surname,userPrincipalName,id'
 
+# Graph API JSON batching
+MAX_BATCH_SIZE = 20
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_AFTER = 'Retry-After'
+RETRY_BACKOFF = 0.5
+
+# Keys required to create a User
+REQUIRED_USER_KEYS = ['accountEnabled', 'displayName', 'mailNickname',
+                    'userPrincipalName', 'passwordProfile']
+
 # Misc dict keys
 ERROR = 'error'
 ACCESS_TOKEN = 'access_token'
 VALUE = 'value'
 NEXT_ODATA = '@odata.nextLink'
+COUNT_ODATA = '@odata.count'
+
+# Header required by Graph for $count on directory objects
+CONSISTENCY_LEVEL_HEADER = {'ConsistencyLevel': 'eventual'}
+
+# Max pages a Paginator holds in memory by default
+DEFAULT_PAGE_CACHE_SIZE = 32
+
+# Default seconds to wait on a Graph API call
+DEFAULT_TIMEOUT = 30
+
+# Max GET responses kept to serve while a circuit breaker is open
+DEFAULT_STALE_CACHE_SIZE = 256
+
+# Hedged request tuning, latency samples kept per endpoint and the least
+# needed before hedging, and the smallest delay a hedge is sent after
+LATENCY_SAMPLE_SIZE = 100
+MIN_HEDGE_SAMPLES = 20
+MIN_HEDGE_DELAY = 0.05
+
+# Subscription dict keys
+CHANGE_TYPE = 'changeType'
+NOTIFICATION_URL = 'notificationUrl'
+RESOURCE = 'resource'
+EXPIRATION_DATE_TIME = 'expirationDateTime'
+CLIENT_STATE = 'clientState'
+SUBSCRIPTION_ID = 'subscriptionId'
+VALIDATION_TOKEN = 'validationToken'
+
+# Longest a subscription to users can last before renewal, in minutes
+MAX_USER_SUBSCRIPTION_MINUTES = 41760
+
+# Default Group dict keys
+DESCRIPTION = 'description'
+GROUP_TYPES = 'groupTypes'
+MAIL_ENABLED = 'mailEnabled'
+SECURITY_ENABLED = 'securityEnabled'
+
+# Group membership delta keys
+DELTA_ODATA = '@odata.deltaLink'
+MEMBERS_DELTA = 'members@delta'
+ODATA_TYPE = '@odata.type'
+REMOVED = '@removed'
+GROUP_ODATA_TYPE = '#microsoft.graph.group'
+
+# Seconds a user's cached group memberships are used for by default
+DEFAULT_MEMBERSHIP_TTL = 300
+
+# Largest page size directory object collections allow
+MAX_DIRECTORY_PAGE_SIZE = 999
 
 # Default User dict keys
 BUSINESS_PHONES = 'businessPhones'
@@ -29,4 +90,40 @@ OFFICE_LOCATION = 'officeLocation'
 PREFERRED_LANGUAGE = 'preferredLanguage'
 SURNAME = 'surname'
 USER_PRINCIPAL_NAME = 'userPrincipalName'
-ID = 'id'
\ No newline at end of file
+ID = 'id'
+# Default DriveItem dict keys
+NAME = 'name'
+SIZE = 'size'
+E_TAG = 'eTag'
+WEB_URL = 'webUrl'
+PARENT_REFERENCE = 'parentReference'
+DRIVE_ID = 'driveId'
+FILE = 'file'
+FOLDER = 'folder'
+DOWNLOAD_URL = '@microsoft.graph.downloadUrl'
+CONFLICT_BEHAVIOR = '@microsoft.graph.conflictBehavior'
+
+# Upload session keys
+UPLOAD_URL = 'uploadUrl'
+NEXT_EXPECTED_RANGES = 'nextExpectedRanges'
+ITEM = 'item'
+
+# Upload chunks must be a multiple of 320 KiB, and at most 60 MiB
+UPLOAD_FRAGMENT_SIZE = 327680
+MAX_UPLOAD_CHUNK_SIZE = 192 * UPLOAD_FRAGMENT_SIZE
+DEFAULT_UPLOAD_CHUNK_SIZE = 32 * UPLOAD_FRAGMENT_SIZE
+
+# Largest file uploaded in a single request instead of an upload session
+SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024
+
+# Size of each ranged request of a download, and of each write to disk
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+
+# Files kept next to a download's destination until it completes
+PARTIAL_DOWNLOAD_SUFFIX = '.part'
+DOWNLOAD_PROGRESS_SUFFIX = '.progress'
+
+# Ranged request headers
+RANGE = 'Range'
+CONTENT_RANGE = 'Content-Range'
@@ -0,0 +1,863 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import (CONFLICT_BEHAVIOR, CONTENT_RANGE,
+                                    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+                                    DEFAULT_UPLOAD_CHUNK_SIZE, DOWNLOAD_BLOCK_SIZE,
+                                    DOWNLOAD_PROGRESS_SUFFIX, DOWNLOAD_URL, DRIVE_ID,
+                                    E_TAG, EXPIRATION_DATE_TIME, FILE, FOLDER, ID,
+                                    ITEM, MAX_UPLOAD_CHUNK_SIZE, NAME,
+                                    NEXT_EXPECTED_RANGES, PARENT_REFERENCE,
+                                    PARTIAL_DOWNLOAD_SUFFIX, RANGE, RETRY_BACKOFF,
+                                    SIMPLE_UPLOAD_LIMIT, SIZE, TRANSIENT_STATUS_CODES,
+                                    UPLOAD_FRAGMENT_SIZE, UPLOAD_URL, WEB_URL)
+from graphappclient.resource import Resource
+from graphappclient.subscription import parse_date_time
+from http import HTTPStatus
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Logger
+logger = logging.getLogger(__name__)
+
+def _parse_ranges(ranges: List[str], size: int) -> List[Tuple[int, int]]:
+    """
+    Parses byte ranges returned by upload sessions, such as ['0-', '26-53']
+
+    Parameters
+        ranges : List[str]
+            Ranges of the form 'start-end' or 'start-'
+        size : int
+            Size of the file, the end of open ranges
+
+    Returns
+        List[Tuple[int, int]]:
+            Inclusive (start, end) byte offsets
+    """
+    parsed = []
+    for byte_range in ranges:
+        start, _, end = byte_range.partition('-')
+        parsed.append((int(start), int(end) if end else size - 1))
+    return parsed
+
+
+def _split_ranges(ranges: List[Tuple[int, int]], chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits inclusive byte ranges into chunks of at most chunk_size bytes
+    """
+    chunks = []
+    for start, end in ranges:
+        for chunk_start in range(start, end + 1, chunk_size):
+            chunks.append((chunk_start, min(chunk_start + chunk_size, end + 1) - 1))
+    return chunks
+
+
+class UploadSession:
+    """
+    Resumable upload of a local file to a drive. The file is sent in chunks
+    read straight from a memory map of it, so it is never copied into memory
+    as a whole. If an upload fails, upload() can be called again to send only
+    the ranges Microsoft is still missing, and the upload can be resumed from
+    another process by creating an UploadSession with the same upload_url,
+    until the session expires. More info found here:
+    https://docs.microsoft.com/en-us/graph/api/driveitem-createuploadsession
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and
+            makes API calls
+        upload_url(str): Pre-authenticated URL the chunks are sent to
+        source_path(str): Path of the local file being uploaded
+        size(int): Size of the file in bytes
+        chunk_size(int): Bytes sent in each request
+        expiration_date_time(datetime): When the session expires
+    """
+
+    def __init__(
+        self,
+        api_connector: APIConnector,
+        upload_url: str,
+        source_path: str,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        next_expected_ranges: Optional[List[str]] = None,
+        expiration_date_time: Optional[str] = None
+    ):
+        """
+        Initializes an UploadSession for a session already created in
+        Microsoft
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            upload_url : str
+                Upload URL of the session
+            source_path : str
+                Path of the local file to upload
+            chunk_size : int
+                Bytes sent in each request, a multiple of 320 KiB up to 60 MiB
+            next_expected_ranges : Optional[List[str]]
+                Ranges Microsoft is missing, fetched before uploading if not
+                provided
+            expiration_date_time : Optional[str]
+                When the session expires
+
+        Raises
+            ValueError:
+                Raises if chunk_size isn't a multiple of 320 KiB up to 60 MiB
+        """
+        self.validate_chunk_size(chunk_size)
+
+        self.graph_connector = api_connector
+        self.upload_url = upload_url
+        self.source_path = source_path
+        self.size = os.path.getsize(source_path)
+        self.chunk_size = chunk_size
+        self.expiration_date_time = parse_date_time(expiration_date_time)
+
+        self._next_expected_ranges = next_expected_ranges
+
+    def __repr__(self):
+        return (f'Upload Session of {self.source_path} ({self.size} bytes) '
+                + f'expiring {self.expiration_date_time}')
+
+    @staticmethod
+    def validate_chunk_size(chunk_size: int):
+        """
+        Parameters
+            chunk_size : int
+                Bytes sent in each request
+
+        Raises
+            ValueError:
+                Raises if chunk_size isn't a multiple of 320 KiB up to 60 MiB
+        """
+        if (chunk_size <= 0 or chunk_size > MAX_UPLOAD_CHUNK_SIZE
+                or chunk_size % UPLOAD_FRAGMENT_SIZE):
+            raise ValueError(f'chunk_size must be a multiple of {UPLOAD_FRAGMENT_SIZE}'
+                            + f' bytes, up to {MAX_UPLOAD_CHUNK_SIZE} bytes')
+
+    def status(self) -> Union[List[Tuple[int, int]], None]:
+        """
+        Gets the byte ranges of the file Microsoft is still missing
+
+        Returns
+            Union[List[Tuple[int, int]], None]:
+                Inclusive (start, end) byte offsets, None if the session could
+                not be fetched
+        """
+        response = self.graph_connector.get(self.upload_url, authenticate=False)
+        if not response.status_code == HTTPStatus.OK: # Checking for 200
+            logger.error('Error when getting upload session from Graph API')
+            logger.error(response.content)
+            return None
+
+        response_data = response.json()
+        self.expiration_date_time = parse_date_time(
+            response_data.get(EXPIRATION_DATE_TIME))
+        return _parse_ranges(response_data.get(NEXT_EXPECTED_RANGES, []),
+                            self.size)
+
+    def cancel(self) -> bool:
+        """
+        Cancels the session, discarding what was uploaded
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        response = self.graph_connector.delete(self.upload_url,
+                                                authenticate=False)
+        if not response.status_code == HTTPStatus.NO_CONTENT: # Checking for 204
+            logger.error('Error when cancelling upload session via Graph API')
+            logger.error(response.content)
+            return False
+
+        return True
+
+    def upload(
+        self,
+        max_workers: int = 1,
+        max_retries: int = 3
+    ) -> Union['DriveItem', None]:
+        """
+        Sends the ranges of the file Microsoft is still missing. Throttled
+        (429) and failed (5xx) chunks are retried up to max_retries times.
+
+        Parameters
+            max_workers : int
+                Chunks sent at once. OneDrive for Business and SharePoint
+                only accept chunks in order, so values above 1 only help
+                where out of order chunks are accepted. If Microsoft rejects
+                them, the rest of the file is sent in order.
+            max_retries : int
+                Times a chunk is retried
+
+        Returns
+            Union[DriveItem, None]:
+                The uploaded file once complete, None if the upload failed
+                and can be resumed
+        """
+        if self._next_expected_ranges is not None:
+            ranges = _parse_ranges(self._next_expected_ranges, self.size)
+            self._next_expected_ranges = None
+        else:
+            ranges = self.status()
+        if ranges is None:
+            return None
+
+        chunks = _split_ranges(ranges, self.chunk_size)
+        with open(self.source_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            view = memoryview(source)
+            try:
+                if max_workers > 1 and len(chunks) > 2:
+                    # The chunk completing the file is held back until the
+                    # others have been received
+                    if self._send_concurrently(view, chunks[:-1], max_workers,
+                                                max_retries):
+                        chunks = chunks[-1:]
+                    else:
+                        logger.warning('Concurrent chunks were rejected, '
+                                    + 'sending the rest of the file in order')
+                        ranges = self.status()
+                        if ranges is None:
+                            return None
+                        chunks = _split_ranges(ranges, self.chunk_size)
+
+                return self._send_in_order(view, chunks, max_retries)
+            finally:
+                view.release()
+
+    def _send_in_order(
+        self,
+        view: memoryview,
+        chunks: List[Tuple[int, int]],
+        max_retries: int
+    ) -> Union['DriveItem', None]:
+        for start, end in chunks:
+            response = self._send_chunk(view, start, end, max_retries)
+            if response is None:
+                return None
+            # 200 or 201 once the last byte is received, 202 before
+            if response.status_code in (HTTPStatus.OK, HTTPStatus.CREATED):
+                return DriveItem(self.graph_connector, response.json())
+
+        logger.error(f'Upload of {self.source_path} ended without Microsoft '
+                    + 'completing the file')
+        return None
+
+    def _send_concurrently(
+        self,
+        view: memoryview,
+        chunks: List[Tuple[int, int]],
+        max_workers: int,
+        max_retries: int
+    ) -> bool:
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix='graphappclient-upload') as executor:
+            futures = [executor.submit(self._send_chunk, view, start, end,
+                                        max_retries)
+                        for start, end in chunks]
+            return all(future.result() is not None for future in futures)
+
+    def _send_chunk(
+        self,
+        view: memoryview,
+        start: int,
+        end: int,
+        max_retries: int
+    ) -> Union['Response', None]:
+        """
+        Sends one chunk of the file, retrying if throttled or failed
+
+        Parameters
+            view : memoryview
+                View of the memory mapped file
+            start : int
+                First byte of the chunk
+            end : int
+                Last byte of the chunk
+            max_retries : int
+                Times the chunk is retried
+
+        Returns
+            Union[Response, None]:
+                Response accepting the chunk, None if it wasn't accepted
+        """
+        from requests import RequestException
+
+        headers = {CONTENT_RANGE: f'bytes {start}-{end}/{self.size}'}
+        response = None
+        for attempt in range(max_retries + 1):
+            chunk = view[start:end + 1] # No copy, read from the file as sent
+            try:
+                response = self.graph_connector.put(self.upload_url, data=chunk,
+                                                    headers=headers,
+                                                    authenticate=False)
+            except RequestException as error:
+                logger.warning(f'Error sending bytes {start}-{end} of '
+                            + f'{self.source_path}: {error}')
+                delay = RETRY_BACKOFF * 2 ** attempt
+            else:
+                if response.status_code in (HTTPStatus.OK, HTTPStatus.CREATED,
+                                            HTTPStatus.ACCEPTED):
+                    return response
+                if response.status_code not in TRANSIENT_STATUS_CODES:
+                    break
+                delay = Resource._retry_after(response.headers, attempt)
+            finally:
+                chunk.release()
+
+            if attempt < max_retries:
+                time.sleep(delay)
+
+        logger.error(f'Error when uploading bytes {start}-{end} of '
+                    + f'{self.source_path} via Graph API')
+        if response is not None:
+            logger.error(response.content)
+        return None
+
+
+class DriveItem(Resource):
+    """
+    Class representing a file or folder in a OneDrive or SharePoint drive.
+    More info found here:
+    https://docs.microsoft.com/en-us/graph/api/resources/driveitem
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and
+            makes API calls
+        id(str): Item's unique Microsoft ID
+        name(str): Name of the file or folder
+        size(int): Size in bytes
+        e_tag(str): Changes whenever the item changes
+        web_url(str): URL of the item in the browser
+        file(dict): File facet, None for folders
+        folder(dict): Folder facet, None for files
+        parent_reference(dict): Info on the item's parent folder
+        drive_id(str): ID of the drive the item is in
+        download_url(str): Short lived pre-authenticated URL of the file's
+            content
+        drive_item_json(dict): JSON representation of the DriveItem object
+    """
+
+    CONTENT = 'content'
+    UPLOAD_SESSION = 'upload_session'
+
+    _endpoints = {
+        CONTENT : '/drives/{drive_id}/items/{parent_id}:/{name}:/content',
+        UPLOAD_SESSION : '/drives/{drive_id}/items/{parent_id}:/{name}:/createUploadSession'
+    }
+
+    _name = 'drive item'
+    _plural = 'drive items'
+    _collection = '/drives'
+    _fields = {
+        'id' : ID,
+        'name' : NAME,
+        'size' : SIZE,
+        'e_tag' : E_TAG,
+        'web_url' : WEB_URL,
+        'file' : FILE,
+        'folder' : FOLDER,
+        'parent_reference' : PARENT_REFERENCE,
+        'download_url' : DOWNLOAD_URL
+    }
+    _json_attribute = 'drive_item_json'
+
+    def __init__(self, api_connector: APIConnector, drive_item_json: dict):
+        """
+        Initializes a DriveItem object.
+
+        Parameters
+            api_connector(APIConnector): Object used for managing authentication and
+                API calls
+            drive_item_json(dict): Representation of DriveItem JSON object to be
+                used in construction of object
+        """
+
+        self.drive_id = None
+        self._refresh_lock = threading.Lock()
+
+        # Super class constructor
+        super().__init__(api_connector, drive_item_json)
+
+    def _load(self, drive_item_json: dict):
+        # The parent reference isn't always returned, so keeping a known drive
+        drive_id = self.drive_id
+        super()._load(drive_item_json)
+        self.drive_id = (self.parent_reference or {}).get(DRIVE_ID) or drive_id
+
+    def _endpoint(self) -> str:
+        return f'{self._collection}/{self.drive_id}/items/{self.id}'
+
+    def __repr__(self):
+        return f'Drive Item {self.name} with ID {self.id}'
+
+    @classmethod
+    def get(
+        cls,
+        api_connector: APIConnector,
+        resource_id: str,
+        select: Optional[List[str]] = None
+    ) -> Union['DriveItem', None]:
+        """
+        Gets one item from a drive
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            resource_id : str
+                ID of the item relative to /drives, see DriveItem.resource_id
+            select : Optional[List[str]]
+                Additional properties to request from Microsoft
+
+        Returns
+            Union[DriveItem, None]:
+                The item if found, None otherwise
+        """
+        drive_item = super().get(api_connector, resource_id, select=select)
+
+        # The drive the item was asked from, as the response may not say
+        if drive_item is not None:
+            drive_item.drive_id = resource_id.split('/', 1)[0]
+        return drive_item
+
+    @staticmethod
+    def resource_id(
+        drive_id: str,
+        item_id: Optional[str] = None,
+        path: Optional[str] = None
+    ) -> str:
+        """
+        Builds the ID DriveItem.get takes for an item in a drive
+
+        Parameters
+            drive_id : str
+                ID of the drive
+            item_id : Optional[str]
+                ID of the item
+            path : Optional[str]
+                Path of the item from the drive's root, used if item_id isn't
+                provided. The root itself if neither is provided
+
+        Returns
+            str:
+                ID of the item relative to /drives
+        """
+        if item_id is not None:
+            return f'{drive_id}/items/{item_id}'
+        if path and path.strip('/'):
+            return f'{drive_id}/root:/{quote(path.strip("/"))}:'
+        return f'{drive_id}/root'
+
+    def download(
+        self,
+        destination: str,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = 4,
+        max_retries: int = 3
+    ) -> bool:
+        """
+        Downloads this file to destination, streaming it to disk in chunks
+        requested in parallel with HTTP range requests. Chunks are written to
+        destination + '.part' and recorded in destination + '.progress' as
+        they complete, so a failed or interrupted download picks up where it
+        stopped when called again, unless the file changed in Microsoft.
+        destination is only created once the download is complete.
+
+        Parameters
+            destination : str
+                Path to save the file to
+            chunk_size : int
+                Bytes requested in each range request
+            max_workers : int
+                Range requests made at once
+            max_retries : int
+                Times a chunk is retried
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        # Download URLs are short lived, so getting a fresh one
+        with self._refresh_lock:
+            if not self._refresh():
+                return False
+            e_tag, size = self.e_tag, self.size
+        if self.download_url is None:
+            logger.error(f'{self} has no content to download')
+            return False
+
+        part_path = destination + PARTIAL_DOWNLOAD_SUFFIX
+        progress_path = destination + DOWNLOAD_PROGRESS_SUFFIX
+        done = self._load_progress(progress_path, part_path, chunk_size)
+        if done is None:
+            done = set()
+            with open(part_path, 'wb') as file:
+                file.truncate(size)
+            self._save_progress(progress_path, e_tag, size, chunk_size, done)
+        elif done:
+            logger.info(f'Resuming download of {self} with {len(done)} chunks'
+                        + ' already downloaded')
+
+        chunks = [(index, start, min(start + chunk_size, size) - 1)
+                    for index, start in enumerate(range(0, size, chunk_size))
+                    if index not in done]
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix='graphappclient-download') as executor:
+            futures = {executor.submit(self._download_chunk, part_path, start,
+                                        end, e_tag, max_retries): index
+                        for index, start, end in chunks}
+            for future in as_completed(futures):
+                if future.result():
+                    done.add(futures[future])
+                    self._save_progress(progress_path, e_tag, size, chunk_size,
+                                        done)
+                else:
+                    failed += 1
+
+        # Chunks of different versions of the file can't be put together
+        if self.e_tag != e_tag:
+            logger.error(f'{self} changed in Microsoft while downloading,'
+                        + ' discarding the download')
+            for path in (part_path, progress_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return False
+
+        if failed:
+            logger.error(f'Error when downloading {self}, {failed} chunks failed'
+                        + ' and can be resumed')
+            return False
+
+        os.replace(part_path, destination)
+        os.remove(progress_path)
+        return True
+
+    def _refresh(self) -> bool:
+        """
+        Gets this item again from Microsoft, refreshing its attributes and
+        download URL
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        response = self.graph_connector.get(self.build_url(self._endpoint()))
+        if not self._check_response(response, HTTPStatus.OK,
+                                    f'getting {self._name} from Graph API'):
+            return False
+
+        self._load(response.json())
+        return True
+
+    def _download_chunk(
+        self,
+        part_path: str,
+        start: int,
+        end: int,
+        e_tag: str,
+        max_retries: int
+    ) -> bool:
+        """
+        Downloads one chunk of the file into the partial file, retrying if
+        throttled, failed, or the download URL expired. Gives up if the file
+        changed in Microsoft since the download started.
+
+        Parameters
+            part_path : str
+                Path of the partial file
+            start : int
+                First byte of the chunk
+            end : int
+                Last byte of the chunk
+            e_tag : str
+                eTag of the file when the download started
+            max_retries : int
+                Times the chunk is retried
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        from requests import RequestException
+
+        headers = {RANGE: f'bytes={start}-{end}'}
+        status = None
+        for attempt in range(max_retries + 1):
+            if self.e_tag != e_tag: # changed, another chunk found out
+                return False
+
+            delay = RETRY_BACKOFF * 2 ** attempt
+            download_url = self.download_url
+            response = None
+            try:
+                response = self.graph_connector.get(download_url,
+                                                    headers=headers, stream=True,
+                                                    authenticate=False)
+                status = response.status_code
+                # A 200 is the whole file, only expected if that was asked for
+                if (status == HTTPStatus.PARTIAL_CONTENT
+                        or (status == HTTPStatus.OK and start == 0
+                            and end == self.size - 1)):
+                    if self._write_chunk(response, part_path, start) == end - start + 1:
+                        return True
+                    logger.warning(f'Incomplete bytes {start}-{end} of {self}')
+                elif status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                    # Download URL expired
+                    if not self._refresh_download_url(download_url, e_tag):
+                        return False
+                    delay = 0
+                elif status in TRANSIENT_STATUS_CODES:
+                    delay = self._retry_after(response.headers, attempt)
+                else:
+                    break
+            except RequestException as error:
+                logger.warning(f'Error downloading bytes {start}-{end} of '
+                            + f'{self}: {error}')
+            finally:
+                if response is not None:
+                    response.close()
+
+            if attempt < max_retries:
+                time.sleep(delay)
+
+        logger.error(f'Error when downloading bytes {start}-{end} of {self} '
+                    + f'via Graph API, last status {status}')
+        return False
+
+    def _refresh_download_url(self, expired_url: str, e_tag: str) -> bool:
+        """
+        Gets a new download URL once the current one expires. Every chunk
+        in flight sees the expiry at about the same time, so only the first
+        refreshes and the rest use the URL it got.
+
+        Parameters
+            expired_url : str
+                Download URL that was rejected
+            e_tag : str
+                eTag of the file when the download started
+
+        Returns
+            bool:
+                Indicates a new URL to the same version of the file was found
+        """
+        with self._refresh_lock:
+            if self.download_url == expired_url and not self._refresh():
+                return False
+            return self.e_tag == e_tag
+
+    @staticmethod
+    def _write_chunk(response: 'Response', part_path: str, start: int) -> int:
+        """
+        Streams a response body into the partial file at start
+
+        Returns
+            int:
+                Number of bytes written
+        """
+        written = 0
+        with open(part_path, 'r+b') as file:
+            file.seek(start)
+            for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+                file.write(block)
+                written += len(block)
+        return written
+
+    def _load_progress(
+        self,
+        progress_path: str,
+        part_path: str,
+        chunk_size: int
+    ) -> Union[Set[int], None]:
+        """
+        Loads the chunks already downloaded by an earlier call
+
+        Returns
+            Union[Set[int], None]:
+                Indexes of the downloaded chunks, None if the download can't
+                be resumed
+        """
+        try:
+            with open(progress_path) as file:
+                progress = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if (progress.get(E_TAG) != self.e_tag or progress.get(SIZE) != self.size
+                or progress.get('chunkSize') != chunk_size
+                or not os.path.exists(part_path)):
+            logger.info(f'Download of {self} can not be resumed, starting over')
+            return None
+
+        return set(progress.get('done', []))
+
+    @staticmethod
+    def _save_progress(
+        progress_path: str,
+        e_tag: str,
+        size: int,
+        chunk_size: int,
+        done: Set[int]
+    ):
+        # Written to a temporary file first so a crash can't leave it corrupt
+        temporary_path = progress_path + '.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump({
+                E_TAG: e_tag,
+                SIZE: size,
+                'chunkSize': chunk_size,
+                'done': sorted(done)
+            }, file)
+        os.replace(temporary_path, progress_path)
+
+    @classmethod
+    def create_upload_session(
+        cls,
+        api_connector: APIConnector,
+        source_path: str,
+        drive_id: str,
+        parent_id: str = 'root',
+        name: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        conflict_behavior: str = 'replace'
+    ) -> Union[UploadSession, None]:
+        """
+        Creates an upload session for a local file. Nothing is sent until its
+        upload() is called
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            source_path : str
+                Path of the local file to upload
+            drive_id : str
+                ID of the drive to upload to
+            parent_id : str
+                ID of the folder to upload to, the drive's root by default
+            name : Optional[str]
+                Name of the file in the drive, the local file's name by default
+            chunk_size : int
+                Bytes sent in each request, a multiple of 320 KiB up to 60 MiB
+            conflict_behavior : str
+                What happens if the name is taken, 'replace', 'rename' or
+                'fail'
+
+        Returns
+            Union[UploadSession, None]:
+                The session if it was created, None otherwise
+
+        Raises
+            ValueError:
+                Raises if chunk_size isn't a multiple of 320 KiB up to 60 MiB
+        """
+        UploadSession.validate_chunk_size(chunk_size)
+
+        graph_api_url = cls._build_url(cls._endpoints[cls.UPLOAD_SESSION].format(
+            drive_id=drive_id,
+            parent_id=parent_id,
+            name=quote(name or os.path.basename(source_path))
+        ))
+
+        # Make POST request
+        response = api_connector.post(graph_api_url,
+                                    {ITEM: {CONFLICT_BEHAVIOR: conflict_behavior}})
+        if not cls._check_response(response, HTTPStatus.OK,
+                                'creating upload session in Graph API'):
+            return None
+
+        response_data = response.json()
+        return UploadSession(
+            api_connector,
+            response_data[UPLOAD_URL],
+            source_path,
+            chunk_size=chunk_size,
+            next_expected_ranges=response_data.get(NEXT_EXPECTED_RANGES),
+            expiration_date_time=response_data.get(EXPIRATION_DATE_TIME)
+        )
+
+    @classmethod
+    def upload(
+        cls,
+        api_connector: APIConnector,
+        source_path: str,
+        drive_id: str,
+        parent_id: str = 'root',
+        name: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        conflict_behavior: str = 'replace'
+    ) -> Union['DriveItem', None]:
+        """
+        Uploads a local file to a drive. Files up to 4 MiB are sent in one
+        request, larger files through an upload session
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            source_path : str
+                Path of the local file to upload
+            drive_id : str
+                ID of the drive to upload to
+            parent_id : str
+                ID of the folder to upload to, the drive's root by default
+            name : Optional[str]
+                Name of the file in the drive, the local file's name by default
+            chunk_size : int
+                Bytes sent in each request, a multiple of 320 KiB up to 60 MiB
+            max_workers : int
+                Chunks sent at once, see UploadSession.upload
+            max_retries : int
+                Times a chunk is retried
+            conflict_behavior : str
+                What happens if the name is taken, 'replace', 'rename' or
+                'fail'
+
+        Returns
+            Union[DriveItem, None]:
+                The uploaded file, None if the upload failed
+        """
+        if os.path.getsize(source_path) > SIMPLE_UPLOAD_LIMIT:
+            session = cls.create_upload_session(
+                api_connector,
+                source_path,
+                drive_id,
+                parent_id=parent_id,
+                name=name,
+                chunk_size=chunk_size,
+                conflict_behavior=conflict_behavior
+            )
+            if session is None:
+                return None
+            return session.upload(max_workers=max_workers,
+                                max_retries=max_retries)
+
+        graph_api_url = cls._build_url(cls._endpoints[cls.CONTENT].format(
+            drive_id=drive_id,
+            parent_id=parent_id,
+            name=quote(name or os.path.basename(source_path))
+        )) + f'?{CONFLICT_BEHAVIOR}={conflict_behavior}'
+
+        with open(source_path, 'rb') as file:
+            response = api_connector.put(graph_api_url, data=file.read())
+
+        # Checking for 201 if the file is new, 200 if it replaced one
+        if response.status_code not in (HTTPStatus.OK, HTTPStatus.CREATED):
+            logger.error(f'Error when uploading {source_path} to Graph API')
+            logger.error(response.content)
+            return None
+
+        drive_item = cls(api_connector, response.json())
+        drive_item.drive_id = drive_id
+        return drive_item
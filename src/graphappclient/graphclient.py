@@ -1,13 +1,22 @@
 from graphappclient.api_connector import APIConnector
-from graphappclient.constants import (BUSINESS_PHONES, DISPLAY_NAME, GIVEN_NAME, ID,
-                                    JOB_TITLE, MAIL, MOBILE_PHONE, OFFICE_LOCATION,
-                                    PREFERRED_LANGUAGE, SURNAME, USER_PRINCIPAL_NAME,
-                                    VALUE, NEXT_ODATA, TOP_QUERY, DEFAULT_USER_SELECT)
-from graphappclient.user import User
+from graphappclient.constants import (CHANGE_TYPE, CLIENT_STATE, DEFAULT_PAGE_CACHE_SIZE,
+                                    DEFAULT_MEMBERSHIP_TTL, DEFAULT_UPLOAD_CHUNK_SIZE,
+                                    EXPIRATION_DATE_TIME, MAX_BATCH_SIZE,
+                                    MAX_USER_SUBSCRIPTION_MINUTES, NOTIFICATION_URL,
+                                    RESOURCE)
+from graphappclient.drive import DriveItem, UploadSession
+from graphappclient.group import Group
+from graphappclient.membership import MembershipCache
+from graphappclient.subscription import Subscription, format_date_time
+from graphappclient.user import User, UserCreationResult
 from graphappclient.utils import APIBase, Paginator
-from http import HTTPStatus
+from concurrent.futures import Executor
+from datetime import datetime, timedelta, timezone
 import logging
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    from requests import Session
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -23,17 +32,15 @@ class GraphAppClient(APIBase):
             makes API calls
     """
 
-    GET_USERS = 'get_users'
-    GET_USER = 'get_user'
-    CREATE_USER = 'create_user'
-
-    _endpoints = {
-        GET_USERS : '/users',
-        GET_USER : '/users/{id}',
-        CREATE_USER : '/users'
-    }
-
-    def __init__(self, client_id: str, tenant_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str,
+        session: Optional['Session'] = None,
+        rate_budget: Optional[Any] = None,
+        **connector_options
+    ):
         """
         Initializes a GraphAppClient with given credentials (does not
         authenticate with Microsoft at initialization)
@@ -45,6 +52,15 @@ class GraphAppClient(APIBase):
                 Tenant ID of application registered in Azure
             client_secret : str
                 Client secret value of application registered in Azure
+            session : Optional[Session]
+                HTTP session to make calls with, can be shared between clients
+                to share its connection pool
+            rate_budget : Optional[Any]
+                Rate limiter with an acquire() method, such as a RateBudget,
+                called before every Graph API call
+            connector_options
+                Other options for the APIConnector, such as timeout,
+                endpoint_timeouts, circuit_breaker, serve_stale and hedge_gets
         """
         # Super class constructor
         super().__init__()
@@ -53,11 +69,14 @@ class GraphAppClient(APIBase):
         self.graph_connector = APIConnector(
             client_id,
             tenant_id,
-            client_secret
+            client_secret,
+            session=session,
+            rate_budget=rate_budget,
+            **connector_options
         )
     
     def __repr__(self):
-        return f'Graph Client with Client ID: {self.graph_connector.msal_app.client_id}'
+        return f'Graph Client with Client ID: {self.graph_connector.client_id}'
     
     def authenticate(self) -> bool:
         """
@@ -76,7 +95,10 @@ class GraphAppClient(APIBase):
         self,
         page_size: Optional[int] = None,
         limit: Optional[int] = None,
-        select: Optional[List[str]] = None
+        select: Optional[List[str]] = None,
+        count: bool = False,
+        max_cached_pages: Optional[int] = DEFAULT_PAGE_CACHE_SIZE,
+        spill_to_disk: bool = False
     ) -> Union[List[User], Paginator, None]:
         """
         Gets and returns a list of User objects in the Microsoft organization
@@ -86,67 +108,76 @@ class GraphAppClient(APIBase):
                 Size of each page of data to be returned from Microsoft API calls
             limit : Optional[int]
                 Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Additional User properties to request from Microsoft
+            count : bool
+                Requests the total number of users with $count, which len() of
+                a returned Paginator needs unless fetch_all() is called first
+            max_cached_pages : Optional[int]
+                Max pages a returned Paginator holds in memory, None for no
+                bound
+            spill_to_disk : bool
+                If True, a returned Paginator writes pages evicted from memory
+                to disk instead of fetching them again
 
         Returns
             Union[List[User], Paginator, None]:
                 A list or Pagination of User objects if found, otherwise None
         """
-        # Get endpoint URL
-        graph_api_url = self.build_url(self._endpoints[self.GET_USERS])
-
-        # Checking for page size request
-        if page_size != None:
-            graph_api_url = f'{graph_api_url}?{TOP_QUERY}{page_size.__str__()}'
-        
-        # Checking for select parameters
-        if select != None:
-            select_query = DEFAULT_USER_SELECT
-            for query in select:
-                select_query = f'{select_query},{query}'
-            
-            if page_size != None:
-                graph_api_url = f'{graph_api_url}&{select_query}'
-            else:
-                graph_api_url = f'{graph_api_url}?{select_query}'
-
-        # Make API call
-        response = self.graph_connector.get(graph_api_url)
-
-        if not response.status_code == HTTPStatus.OK: # Checking for 200
-            logger.error('Error when getting users from Graph API')
-            logger.error(response.content)
-            return None
-        
-        response_data = response.json()
-
-        # Gets list of User JSON's
-        user_json_list = response_data.get(VALUE)
-
-        # Checking limit
-        limit_reached = False
-        if limit and len(user_json_list) > limit:
-            user_json_list = user_json_list[:limit]
-            limit_reached = True
+        return User.list(
+            self.graph_connector,
+            page_size=page_size,
+            limit=limit,
+            select=select,
+            count=count,
+            max_cached_pages=max_cached_pages,
+            spill_to_disk=spill_to_disk
+        )
+    
+    def map_users(
+        self,
+        mapper: Callable[[dict], Any],
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        processes: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ) -> Iterator[Any]:
+        """
+        Walks every user in the Microsoft organization, decoding pages and
+        applying mapper to each user's JSON in a process pool so large walks
+        can use every core. Results are yielded in the same order get_users
+        would return users.
 
-        user_object_list = []
-        for user_json in user_json_list:
-            # Creating new User object
-            new_user = User(self.graph_connector, user_json)
+        Parameters
+            mapper : Callable[[dict], Any]
+                Function applied to each user's JSON. It's run in other
+                processes, so it and its results must be picklable (e.g.
+                defined at module level)
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Additional User properties to request from Microsoft
+            processes : Optional[int]
+                Processes in the pool, defaults to one per CPU
+            executor : Optional[Executor]
+                Pool to use instead of creating one, so it can be reused
 
-            # Adding to User list to return
-            user_object_list.append(new_user)
-        
-        if NEXT_ODATA not in response_data or limit_reached:
-            return user_object_list
-        else: # time for pagination
-            user_paginator = Paginator(
-                self.graph_connector,
-                user_object_list,
-                response_data.get(NEXT_ODATA),
-                User,
-                limit=limit
-            )
-            return user_paginator
+        Returns
+            Iterator[Any]:
+                mapper's result for each user
+        """
+        return User.map(
+            self.graph_connector,
+            mapper,
+            page_size=page_size,
+            limit=limit,
+            select=select,
+            processes=processes,
+            executor=executor
+        )
     
     def get_user(
         self,
@@ -175,37 +206,15 @@ class GraphAppClient(APIBase):
                 Raises this error if neither argument is provided
         """
 
-        if user_id:
-            # Build endpoint and URL
-            user_fetch_endpoint = self._endpoints[self.GET_USER].format(id=user_id)
-            graph_api_url = self.build_url(user_fetch_endpoint)
-        elif user_principal_name:
-            # Build endpoint and URL
-            user_fetch_endpoint = self._endpoints[self.GET_USER].format(id=user_principal_name)
-            graph_api_url = self.build_url(user_fetch_endpoint)
-        else:
+        if not user_id and not user_principal_name:
             raise ValueError('Either a user_id or a user_principal_name must'
                                 + ' be provided.')
-        
-        # Checking for select parameters
-        if select != None:
-            select_query = DEFAULT_USER_SELECT
-            for query in select:
-                select_query = f'{select_query},{query}'
-            
-            graph_api_url = f'{graph_api_url}?{select_query}'
-
-        # Make API call
-        response = self.graph_connector.get(graph_api_url)
-        if not response.status_code == HTTPStatus.OK: # Checking for 200
-            logger.error('Error when getting user from Graph API')
-            logger.error(response.content)
-            return None
-        
-        user_json = response.json()
-        new_user = User(self.graph_connector, user_json)
-        
-        return new_user
+
+        return User.get(
+            self.graph_connector,
+            user_id or user_principal_name,
+            select=select
+        )
     
     def create_user(self, user_data: dict) -> Union[User, None]:
         """
@@ -241,25 +250,312 @@ class GraphAppClient(APIBase):
             and Create User, as well as our documentation
         """
 
-        # Checking if required data is in provided JSON for POST
-        required_keys = ['accountEnabled', 'displayName', 'mailNickname',
-                        'userPrincipalName', 'passwordProfile']
-        for key in required_keys:
-            if key not in user_data:
-                raise ValueError(f'Key "{key}" is required and was not provided'
-                                + ' in the user_data parameter')
-        
-        # Build URL for HTTP request
-        graph_api_url = self.build_url(self._endpoints[self.CREATE_USER])
-
-        # Make POST request
-        response = self.graph_connector.post(graph_api_url, user_data)
-        if not response.status_code == HTTPStatus.CREATED: # Checking for 201
-            logger.error('Error when creating user in Graph API')
-            logger.error(response.content)
-            return None
-        
-        user_json = response.json()
-        new_user = User(self.graph_connector, user_json)
-        
-        return new_user
\ No newline at end of file
+        return User.create(self.graph_connector, user_data)
+    
+    def create_users(
+        self,
+        users_data: Iterable[dict],
+        batch_size: int = MAX_BATCH_SIZE,
+        max_in_flight: int = 4,
+        max_retries: int = 3,
+        use_batch: bool = True
+    ) -> Iterator[UserCreationResult]:
+        """
+        Creates many users in the Microsoft organization. Records are read from
+        users_data as they are needed, so it can be a generator over a large
+        file, and are sent in JSON batches (or one request each if use_batch
+        is False) with at most max_in_flight requests outstanding. Records are
+        only read once there is room for them, so a slow API slows the reading
+        rather than filling memory. Throttled and failed requests are retried.
+
+        Parameters
+            users_data : Iterable[dict]
+                dictionaries representing user data to be POST'd to Microsoft,
+                each needing the same fields as create_user
+            batch_size : int
+                Users sent in each JSON batch, at most 20
+            max_in_flight : int
+                Max requests outstanding at once
+            max_retries : int
+                Times a throttled or failed request is retried
+            use_batch : bool
+                If False, each user is sent in its own request
+
+        Returns
+            Iterator[UserCreationResult]:
+                A result for every record in users_data, in the order they
+                finish. Records missing required fields are reported without
+                being sent
+
+        Raises
+            ValueError:
+                Raises if batch_size or max_in_flight are out of range
+        """
+        return User.create_many(
+            self.graph_connector,
+            users_data,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            max_retries=max_retries,
+            use_batch=use_batch
+        )
+    
+    def create_subscription(
+        self,
+        notification_url: str,
+        resource: str = '/users',
+        change_type: str = 'updated,deleted',
+        expiration: Optional[datetime] = None,
+        client_state: Optional[str] = None
+    ) -> Union[Subscription, None]:
+        """
+        Subscribes to change notifications for a resource, users by default,
+        so changes are sent to notification_url instead of having to poll for
+        them. Microsoft validates notification_url while the subscription is
+        being created, so a receiver such as a NotificationReceiver must
+        already be listening there.
+
+        Parameters
+            notification_url : str
+                Public HTTPS URL notifications are sent to
+            resource : str
+                Resource to watch, such as '/users' or '/users/{id}'
+            change_type : str
+                Comma separated changes to be notified of, from 'created',
+                'updated' and 'deleted'
+            expiration : Optional[datetime]
+                When the subscription expires, defaults to the longest
+                Microsoft allows for users
+            client_state : Optional[str]
+                Secret sent with each notification to prove it came from
+                Microsoft
+
+        Returns
+            Union[Subscription, None]:
+                A Subscription object if it was created, None otherwise
+        """
+        if expiration is None:
+            expiration = datetime.now(timezone.utc) + timedelta(
+                minutes=MAX_USER_SUBSCRIPTION_MINUTES - 1)
+
+        subscription_data = {
+            CHANGE_TYPE: change_type,
+            NOTIFICATION_URL: notification_url,
+            RESOURCE: resource,
+            EXPIRATION_DATE_TIME: format_date_time(expiration)
+        }
+        if client_state is not None:
+            subscription_data[CLIENT_STATE] = client_state
+
+        subscription = Subscription.create(self.graph_connector, subscription_data)
+
+        # Microsoft doesn't return the client state, so keeping what was sent
+        if subscription is not None and subscription.client_state is None:
+            subscription.client_state = client_state
+        return subscription
+    
+    def get_subscriptions(self) -> Union[List[Subscription], None]:
+        """
+        Gets the active subscriptions of this application
+
+        Returns
+            Union[List[Subscription], None]:
+                A list of Subscription objects if found, otherwise None
+        """
+        return Subscription.list(self.graph_connector)
+    
+    def get_groups(
+        self,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        count: bool = False
+    ) -> Union[List[Group], Paginator, None]:
+        """
+        Gets and returns a list of Group objects in the Microsoft organization
+
+        Parameters
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Group properties to request from Microsoft
+            count : bool
+                Requests the total number of groups with $count
+
+        Returns
+            Union[List[Group], Paginator, None]:
+                A list or Pagination of Group objects if found, otherwise None
+        """
+        return Group.list(
+            self.graph_connector,
+            page_size=page_size,
+            limit=limit,
+            select=select,
+            count=count
+        )
+    
+    def get_group(
+        self,
+        group_id: str,
+        select: Optional[List[str]] = None
+    ) -> Union[Group, None]:
+        """
+        Gets a group via its ID
+
+        Parameters
+            group_id : str
+                Group ID to fetch group from
+            select : Optional[List[str]]
+                Group properties to request from Microsoft
+
+        Returns
+            Union[Group, None]:
+                A Group object if the group is found, None otherwise.
+        """
+        return Group.get(self.graph_connector, group_id, select=select)
+    
+    def membership_cache(
+        self,
+        ttl: float = DEFAULT_MEMBERSHIP_TTL,
+        max_users: Optional[int] = None
+    ) -> MembershipCache:
+        """
+        Creates a MembershipCache on this client's connection, for answering
+        "is this user in this group" locally
+
+        Parameters
+            ttl : float
+                Seconds a user's cached groups are used for
+            max_users : Optional[int]
+                Max users cached at once, None for no bound
+
+        Returns
+            MembershipCache:
+                A new, empty cache
+        """
+        return MembershipCache(self.graph_connector, ttl=ttl, max_users=max_users)
+    
+    def get_drive_item(
+        self,
+        drive_id: str,
+        item_id: Optional[str] = None,
+        path: Optional[str] = None,
+        select: Optional[List[str]] = None
+    ) -> Union[DriveItem, None]:
+        """
+        Gets a file or folder in a drive via its ID or its path
+
+        Parameters
+            drive_id : str
+                ID of the drive, such as a user's OneDrive
+            item_id : Optional[str]
+                ID of the item, prioritized over path
+            path : Optional[str]
+                Path of the item from the drive's root, such as
+                'Reports/2022.xlsx'. The root itself if neither is provided
+            select : Optional[List[str]]
+                DriveItem properties to request from Microsoft
+
+        Returns
+            Union[DriveItem, None]:
+                A DriveItem object if the item is found, None otherwise.
+        """
+        return DriveItem.get(
+            self.graph_connector,
+            DriveItem.resource_id(drive_id, item_id=item_id, path=path),
+            select=select
+        )
+    
+    def upload_file(
+        self,
+        source_path: str,
+        drive_id: str,
+        parent_id: str = 'root',
+        name: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        conflict_behavior: str = 'replace'
+    ) -> Union[DriveItem, None]:
+        """
+        Uploads a local file to a drive, through an upload session if it is
+        larger than 4 MiB
+
+        Parameters
+            source_path : str
+                Path of the local file to upload
+            drive_id : str
+                ID of the drive to upload to
+            parent_id : str
+                ID of the folder to upload to, the drive's root by default
+            name : Optional[str]
+                Name of the file in the drive, the local file's name by default
+            chunk_size : int
+                Bytes sent in each request, a multiple of 320 KiB up to 60 MiB
+            max_workers : int
+                Chunks sent at once, where Microsoft accepts them out of order
+            max_retries : int
+                Times a chunk is retried
+            conflict_behavior : str
+                What happens if the name is taken, 'replace', 'rename' or
+                'fail'
+
+        Returns
+            Union[DriveItem, None]:
+                The uploaded file, None if the upload failed
+        """
+        return DriveItem.upload(
+            self.graph_connector,
+            source_path,
+            drive_id,
+            parent_id=parent_id,
+            name=name,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            max_retries=max_retries,
+            conflict_behavior=conflict_behavior
+        )
+    
+    def create_upload_session(
+        self,
+        source_path: str,
+        drive_id: str,
+        parent_id: str = 'root',
+        name: Optional[str] = None,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        conflict_behavior: str = 'replace'
+    ) -> Union[UploadSession, None]:
+        """
+        Creates a resumable upload session for a local file, for uploads that
+        need to survive failures or restarts
+
+        Parameters
+            source_path : str
+                Path of the local file to upload
+            drive_id : str
+                ID of the drive to upload to
+            parent_id : str
+                ID of the folder to upload to, the drive's root by default
+            name : Optional[str]
+                Name of the file in the drive, the local file's name by default
+            chunk_size : int
+                Bytes sent in each request, a multiple of 320 KiB up to 60 MiB
+            conflict_behavior : str
+                What happens if the name is taken, 'replace', 'rename' or
+                'fail'
+
+        Returns
+            Union[UploadSession, None]:
+                The session if it was created, None otherwise
+        """
+        return DriveItem.create_upload_session(
+            self.graph_connector,
+            source_path,
+            drive_id,
+            parent_id=parent_id,
+            name=name,
+            chunk_size=chunk_size,
+            conflict_behavior=conflict_behavior
+        )
@@ -0,0 +1,107 @@
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import (DESCRIPTION, DISPLAY_NAME, GROUP_TYPES, ID, MAIL,
+                                    MAIL_ENABLED, SECURITY_ENABLED)
+from graphappclient.resource import CollectionResource
+from graphappclient.utils import Paginator
+import logging
+from typing import TYPE_CHECKING, List, Optional, Union
+
+if TYPE_CHECKING:
+    from graphappclient.user import User
+
+# Logger
+logger = logging.getLogger(__name__)
+
+class Group(CollectionResource):
+    """
+    Class representing a group object for Microsoft. More info found here:
+    https://docs.microsoft.com/en-us/graph/api/resources/group
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and
+            makes API calls
+        display_name(str): Group's MS display name
+        description(str): Group's description
+        mail(str): Group's email address
+        mail_enabled(bool): Whether the group is mail enabled
+        security_enabled(bool): Whether the group is a security group
+        group_types(List[str]): Group types, such as 'Unified' for Microsoft
+            365 groups
+        id(str): Group's unique Microsoft ID
+        group_json(dict): JSON representation of the Group object
+    """
+
+    MEMBERS = 'members'
+    TRANSITIVE_MEMBERS = 'transitive_members'
+
+    _endpoints = {
+        MEMBERS : '/groups/{id}/members/microsoft.graph.user',
+        TRANSITIVE_MEMBERS : '/groups/{id}/transitiveMembers/microsoft.graph.user'
+    }
+
+    _name = 'group'
+    _plural = 'groups'
+    _collection = '/groups'
+    _fields = {
+        'display_name' : DISPLAY_NAME,
+        'description' : DESCRIPTION,
+        'mail' : MAIL,
+        'mail_enabled' : MAIL_ENABLED,
+        'security_enabled' : SECURITY_ENABLED,
+        'group_types' : GROUP_TYPES,
+        'id' : ID
+    }
+    _json_attribute = 'group_json'
+
+    def __init__(self, api_connector: APIConnector, group_json: dict):
+        """
+        Initializes a Group object.
+
+        Parameters
+            api_connector(APIConnector): Object used for managing authentication and
+                API calls
+            group_json(dict): Representation of Group JSON object to be used in
+                construction of object
+        """
+
+        # Super class constructor
+        super().__init__(api_connector, group_json)
+
+    def __repr__(self):
+        return f'Group {self.display_name} with ID {self.id}'
+
+    def get_members(
+        self,
+        transitive: bool = False,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> Union[List['User'], Paginator, None]:
+        """
+        Gets the users that are members of this group
+
+        Parameters
+            transitive : bool
+                If True, users that are members through nested groups are
+                included
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Additional User properties to request from Microsoft
+
+        Returns
+            Union[List[User], Paginator, None]:
+                A list or Pagination of User objects if found, otherwise None
+        """
+        from graphappclient.user import User
+
+        endpoint_key = self.TRANSITIVE_MEMBERS if transitive else self.MEMBERS
+        return User.list(
+            self.graph_connector,
+            page_size=page_size,
+            limit=limit,
+            select=select,
+            endpoint=self._endpoints[endpoint_key].format(id=self.id)
+        )
@@ -0,0 +1,335 @@
+from collections import OrderedDict
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import (DEFAULT_MEMBERSHIP_TTL, DELTA_ODATA, ID,
+                                    MAX_DIRECTORY_PAGE_SIZE, MEMBERS_DELTA,
+                                    NEXT_ODATA, REMOVED, VALUE)
+from graphappclient.group import Group
+from graphappclient.user import User
+from graphappclient.utils import APIBase
+from http import HTTPStatus
+import logging
+import threading
+import time
+from typing import FrozenSet, Optional, Set, Union
+
+# Logger
+logger = logging.getLogger(__name__)
+
+class MembershipCache(APIBase):
+    """
+    Cache of the groups each user is a member of, including through nested
+    groups, so checks like "is this user in this group" are local lookups
+    instead of walks through pages of memberships. A user's groups are fetched
+    the first time they are needed and kept for ttl seconds. refresh() uses
+    group delta queries to find the memberships changed in Microsoft since it
+    was last called, and drops the cached users they affect, so a short
+    refresh interval keeps the cache current while the ttl is kept long.
+    Groups fetched while memberships changed aren't cached, as they may be
+    from before the change.
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and makes API calls
+        ttl(float): Seconds a user's cached groups are used for
+        max_users(int): Max users cached at once, least recently used are
+            dropped first, None for no bound
+    """
+
+    DELTA = 'delta'
+    DELTA_LATEST = 'delta_latest'
+
+    _endpoints = {
+        DELTA : '/groups/delta?$select=members',
+        DELTA_LATEST : '/groups/delta?$select=members&$deltaToken=latest'
+    }
+
+    def __init__(
+        self,
+        api_connector: APIConnector,
+        ttl: float = DEFAULT_MEMBERSHIP_TTL,
+        max_users: Optional[int] = None
+    ):
+        """
+        Initializes an empty MembershipCache
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            ttl : float
+                Seconds a user's cached groups are used for
+            max_users : Optional[int]
+                Max users cached at once, None for no bound
+        """
+
+        # Super class constructor
+        super().__init__()
+
+        if max_users is not None and max_users < 1:
+            raise ValueError('max_users must be at least 1 or None')
+
+        self.graph_connector = api_connector
+        self.ttl = ttl
+        self.max_users = max_users
+
+        self._users = OrderedDict() # user ID -> (expires at, group IDs)
+        self._group_users = {} # group ID -> cached user IDs in it
+        self._delta_link = None
+        self._generation = 0 # increased whenever memberships change
+        self._lock = threading.Lock()
+        self._refresh_timer = None
+
+    def __repr__(self):
+        return f'Membership Cache of {len(self._users)} users'
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get_groups(self, user_id: str) -> Union[FrozenSet[str], None]:
+        """
+        Gets the IDs of every group a user is a member of, directly or through
+        nested groups
+
+        Parameters
+            user_id : str
+                User's unique Microsoft ID
+
+        Returns
+            Union[FrozenSet[str], None]:
+                IDs of the user's groups, None if they could not be fetched
+        """
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._users.move_to_end(user_id)
+                return entry[1]
+            generation = self._generation
+
+        group_ids = self._fetch_groups(user_id)
+        if group_ids is None:
+            return None
+
+        with self._lock:
+            # Changed while fetching, so they may be out of date already
+            if self._generation == generation:
+                self._store(user_id, group_ids)
+        return group_ids
+
+    def is_member(self, user_id: str, group_id: str) -> bool:
+        """
+        Checks whether a user is a member of a group, directly or through
+        nested groups
+
+        Parameters
+            user_id : str
+                User's unique Microsoft ID
+            group_id : str
+                Group's unique Microsoft ID
+
+        Returns
+            bool:
+                Indicates membership, False if it could not be checked
+        """
+        group_ids = self.get_groups(user_id)
+        return group_ids is not None and group_id in group_ids
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """
+        Drops a user from the cache, or every user if none is given
+
+        Parameters
+            user_id : Optional[str]
+                User's unique Microsoft ID
+        """
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._users.clear()
+                self._group_users.clear()
+            else:
+                self._remove(user_id)
+
+    def refresh(self) -> bool:
+        """
+        Drops the cached users affected by group membership changes made since
+        the last refresh. The first call records where changes start from and
+        drops every cached user, as changes before it can't be known.
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        # Starting from the latest state skips enumerating every group
+        initial = self._delta_link is None
+        url = (self.build_url(self._endpoints[self.DELTA_LATEST]) if initial
+                else self._delta_link)
+
+        changed_groups = set()
+        changed_members = set()
+        delta_link = None
+        while url:
+            response = self.graph_connector.get(url)
+            if response.status_code == HTTPStatus.GONE: # delta link expired
+                logger.warning('Group delta link expired, clearing membership'
+                            + ' cache')
+                self._delta_link = None
+                self.invalidate()
+                return self.refresh()
+            if not response.status_code == HTTPStatus.OK: # Checking for 200
+                logger.error('Error when getting group changes from Graph API')
+                logger.error(response.content)
+                return False
+
+            response_data = response.json()
+            for group_json in response_data.get(VALUE, []):
+                members = group_json.get(MEMBERS_DELTA)
+                if members is None and REMOVED not in group_json:
+                    continue # only other properties changed
+                changed_groups.add(group_json.get(ID))
+                for member in members or []:
+                    changed_members.add(member.get(ID))
+
+            url = response_data.get(NEXT_ODATA)
+            delta_link = response_data.get(DELTA_ODATA, delta_link)
+
+        self._delta_link = delta_link
+        if initial:
+            self.invalidate()
+        else:
+            self._invalidate_changed(changed_groups, changed_members)
+        return True
+
+    def start_auto_refresh(self, interval: float = 60):
+        """
+        Calls refresh() every interval seconds in a background thread until
+        stop_auto_refresh() is called
+
+        Parameters
+            interval : float
+                Seconds between refreshes
+        """
+        def run():
+            self.refresh()
+            with self._lock:
+                if self._refresh_timer is not None: # not stopped
+                    self._schedule(run, interval)
+
+        self.refresh()
+        with self._lock:
+            self._schedule(run, interval)
+
+    def stop_auto_refresh(self):
+        """
+        Stops background refreshes
+        """
+        with self._lock:
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+
+    def _schedule(self, run, interval: float):
+        self._refresh_timer = threading.Timer(interval, run)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _fetch_groups(self, user_id: str) -> Union[FrozenSet[str], None]:
+        """
+        Fetches the IDs of a user's groups from Microsoft. Pages are walked
+        here rather than through a Paginator, which stops quietly at a page it
+        can't get, so a partial set of groups is never cached.
+
+        Parameters
+            user_id : str
+                User's unique Microsoft ID
+
+        Returns
+            Union[FrozenSet[str], None]:
+                IDs of the user's groups, None if they could not all be fetched
+        """
+        url = Group._build_list_url(
+            User._endpoints[User.TRANSITIVE_MEMBER_OF].format(id=user_id),
+            page_size=MAX_DIRECTORY_PAGE_SIZE,
+            select=[ID]
+        )
+
+        group_ids = set()
+        while url:
+            response = self.graph_connector.get(url)
+            if not response.status_code == HTTPStatus.OK: # Checking for 200
+                logger.error('Error when getting groups of user from Graph API')
+                logger.error(response.content)
+                return None
+
+            response_data = response.json()
+            group_ids.update(group_json.get(ID)
+                            for group_json in response_data.get(VALUE, []))
+            url = response_data.get(NEXT_ODATA)
+
+        return frozenset(group_ids)
+
+    def _store(self, user_id: str, group_ids: FrozenSet[str]):
+        """
+        Adds a user to the cache, dropping the least recently used users if it
+        is full. Must be called with the lock held.
+
+        Parameters
+            user_id : str
+                User's unique Microsoft ID
+            group_ids : FrozenSet[str]
+                IDs of the user's groups
+        """
+        self._remove(user_id)
+        self._users[user_id] = (time.monotonic() + self.ttl, group_ids)
+        for group_id in group_ids:
+            self._group_users.setdefault(group_id, set()).add(user_id)
+
+        while self.max_users is not None and len(self._users) > self.max_users:
+            self._remove(next(iter(self._users)))
+
+    def _remove(self, user_id: str):
+        """
+        Removes a user from the cache. Must be called with the lock held.
+
+        Parameters
+            user_id : str
+                User's unique Microsoft ID
+        """
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+
+        for group_id in entry[1]:
+            user_ids = self._group_users.get(group_id)
+            if user_ids is not None:
+                user_ids.discard(user_id)
+                if not user_ids:
+                    del self._group_users[group_id]
+
+    def _invalidate_changed(self, changed_groups: Set[str], changed_members: Set[str]):
+        """
+        Drops the cached users affected by membership changes. A user is
+        affected if they were added to or removed from a group, or if they are
+        in a group whose members changed or that was itself added to or
+        removed from a group.
+
+        Parameters
+            changed_groups : Set[str]
+                IDs of groups whose members changed
+            changed_members : Set[str]
+                IDs of users and groups added to or removed from them
+        """
+        if not changed_groups and not changed_members:
+            return
+
+        with self._lock:
+            # Users being fetched may be affected without being cached yet
+            self._generation += 1
+            affected = set(user_id for user_id in changed_members
+                            if user_id in self._users)
+            for group_id in changed_groups | changed_members:
+                affected.update(self._group_users.get(group_id, ()))
+
+            for user_id in affected:
+                self._remove(user_id)
+
+        if affected:
+            logger.info(f'Dropped {len(affected)} users with changed group'
+                        + ' memberships from cache')
@@ -0,0 +1,193 @@
+from graphappclient.constants import (CLIENT_STATE, SUBSCRIPTION_ID, VALIDATION_TOKEN,
+                                    VALUE)
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Logger
+logger = logging.getLogger(__name__)
+
+class NotificationReceiver:
+
+    """
+    Small HTTP server that receives change notifications from Microsoft. It
+    answers the validation handshake Microsoft makes when a subscription is
+    created, checks each notification's client state, and passes
+    notifications to the registered callbacks. Microsoft only sends
+    notifications to public HTTPS URLs, so in production it is run behind a
+    reverse proxy or tunnel, with that public URL used as the notification URL.
+
+    Attributes
+        host(str): Host the server listens on
+        port(int): Port the server listens on, chosen when started if 0
+        path(str): URL path notifications are accepted on
+        client_state(str): Secret notifications must carry, None to accept
+            any
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        path: str = '/',
+        client_state: Optional[str] = None
+    ):
+        """
+        Initializes a NotificationReceiver. It doesn't listen until started.
+
+        Parameters
+            host : str
+                Host to listen on
+            port : int
+                Port to listen on, 0 picks a free port
+            path : str
+                URL path to accept notifications on
+            client_state : Optional[str]
+                Secret notifications must carry, should match the client_state
+                the subscriptions were created with
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.client_state = client_state
+
+        self._callbacks = []
+        self._server = None
+        self._thread = None
+
+    def __repr__(self):
+        return f'Notification Receiver on {self.url}'
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """
+        Local URL the receiver accepts notifications on
+        """
+        return f'http://{self.host}:{self.port}{self.path}'
+
+    def add_callback(
+        self,
+        callback: Callable[[dict], None],
+        subscription_id: Optional[str] = None
+    ):
+        """
+        Registers a function to be called with each notification received
+
+        Parameters
+            callback : Callable[[dict], None]
+                Function called with the JSON of each notification
+            subscription_id : Optional[str]
+                Only call it for notifications from this subscription
+        """
+        self._callbacks.append((callback, subscription_id))
+
+    def start(self):
+        """
+        Starts listening in a background thread
+        """
+        if self._server is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port),
+                                        self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='graphappclient-notifications',
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f'Listening for notifications on {self.url}')
+
+    def stop(self):
+        """
+        Stops listening
+        """
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+
+    def dispatch(self, notification: dict) -> bool:
+        """
+        Passes a notification to the registered callbacks if its client state
+        matches. Called for every notification received, and can be called
+        directly when notifications arrive another way.
+
+        Parameters
+            notification : dict
+                JSON of the notification
+
+        Returns
+            bool:
+                Indicates whether the notification was accepted
+        """
+        if (self.client_state is not None
+                and notification.get(CLIENT_STATE) != self.client_state):
+            logger.warning('Dropped notification with wrong client state for '
+                        + f'subscription {notification.get(SUBSCRIPTION_ID)}')
+            return False
+
+        for callback, subscription_id in list(self._callbacks):
+            if subscription_id and notification.get(SUBSCRIPTION_ID) != subscription_id:
+                continue
+            try:
+                callback(notification)
+            except Exception:
+                logger.exception('Notification callback raised')
+
+        return True
+
+    def _handler_class(self) -> type:
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path != receiver.path:
+                    self._respond(HTTPStatus.NOT_FOUND)
+                    return
+
+                # Validation handshake, the token is echoed back as plain text
+                token = parse_qs(url.query).get(VALIDATION_TOKEN)
+                if token:
+                    self._respond(HTTPStatus.OK, token[0].encode())
+                    return
+
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    notifications = json.loads(self.rfile.read(length)).get(VALUE, [])
+                except (ValueError, AttributeError):
+                    self._respond(HTTPStatus.BAD_REQUEST)
+                    return
+
+                # Microsoft expects a quick answer, so callbacks run afterwards
+                self._respond(HTTPStatus.ACCEPTED)
+                for notification in notifications:
+                    receiver.dispatch(notification)
+
+            def _respond(self, status: HTTPStatus, body: bytes = b''):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
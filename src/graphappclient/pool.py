@@ -0,0 +1,326 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from graphappclient.graphclient import GraphAppClient
+from graphappclient.utils import CircuitBreaker, RateBudget
+from http.cookiejar import DefaultCookiePolicy
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+# Logger
+logger = logging.getLogger(__name__)
+
+class GraphClientPool:
+
+    """
+    Hands out GraphAppClient objects for many tenants from one place. Every
+    client shares one HTTP session (and so one connection pool) and one thread
+    pool, while keeping its own MSAL token cache, rate budget and circuit
+    breaker. Clients are only created when a tenant is first used, and idle
+    tenants are evicted, so memory and sockets scale with the active tenants
+    rather than the registered ones. A tenant's rate budget and circuit
+    breaker outlive its client, so evicting and rebuilding a client doesn't
+    reset them. The shared session doesn't keep cookies, so none are sent
+    from one tenant's calls to another's.
+
+    Attributes
+        session(Session): HTTP session shared by every client in the pool
+        max_active_tenants(int): Max clients kept at once, None for no bound
+        idle_timeout(float): Seconds a client can go unused before it is
+            evicted, None to never evict for idleness
+        requests_per_second(float): Rate budget of each tenant, None for no
+            budget
+        circuit_breaker_factory(Callable[[], CircuitBreaker]): Makes each
+            tenant's circuit breaker, None for no circuit breakers
+        connector_options(dict): Options passed to every client's APIConnector
+    """
+
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        max_active_tenants: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        requests_per_second: Optional[float] = None,
+        max_connections: int = 10,
+        max_workers: Optional[int] = None,
+        circuit_breaker_factory: Optional[Callable[[], CircuitBreaker]] = None,
+        **connector_options
+    ):
+        """
+        Initializes a GraphClientPool. The client ID and secret are used for
+        every tenant that doesn't register its own, which suits multi-tenant
+        applications registered once in Azure.
+
+        Parameters
+            client_id : Optional[str]
+                Default client ID of application registered in Azure
+            client_secret : Optional[str]
+                Default client secret value of application registered in Azure
+            max_active_tenants : Optional[int]
+                Max clients kept at once, least recently used are evicted first
+            idle_timeout : Optional[float]
+                Seconds a client can go unused before it is evicted
+            requests_per_second : Optional[float]
+                Calls per second allowed for each tenant
+            max_connections : int
+                Max connections kept open per host by the shared session
+            max_workers : Optional[int]
+                Max threads in the shared thread pool
+            circuit_breaker_factory : Optional[Callable[[], CircuitBreaker]]
+                Called once per tenant to make its circuit breaker, so one
+                tenant's failing calls don't open circuits for the others
+            connector_options
+                Options passed to every client's APIConnector, such as timeout,
+                endpoint_timeouts or hedge_gets
+
+        Raises
+            ValueError:
+                Raises if max_active_tenants is below 1, or a circuit_breaker
+                is passed, which every tenant would share
+        """
+        if max_active_tenants is not None and max_active_tenants < 1:
+            raise ValueError('max_active_tenants must be at least 1 or None')
+        if 'circuit_breaker' in connector_options:
+            raise ValueError('A circuit_breaker would be shared by every tenant,'
+                            + ' pass a circuit_breaker_factory instead')
+
+        self.max_active_tenants = max_active_tenants
+        self.idle_timeout = idle_timeout
+        self.requests_per_second = requests_per_second
+        self.circuit_breaker_factory = circuit_breaker_factory
+        self.connector_options = connector_options
+
+        # Shared transport, with cookies rejected so that none set by one
+        # tenant's token or Graph calls are sent with another's
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=max_connections,
+                            pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._max_workers = max_workers
+        self._executor = None
+
+        self._credentials = {}
+        self._clients = OrderedDict()
+        self._last_used = {}
+        self._rate_budgets = {} # kept across evictions, they're small
+        self._circuit_breakers = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f'Graph Client Pool with {len(self._clients)} active of '
+                + f'{len(self._credentials)} registered tenants')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool shared by every tenant, created on first use
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='graphappclient'
+                )
+            return self._executor
+
+    def register_tenant(
+        self,
+        tenant_id: str,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None
+    ):
+        """
+        Registers a tenant with the pool. No client is created until the tenant
+        is used.
+
+        Parameters
+            tenant_id : str
+                Tenant ID to register
+            client_id : Optional[str]
+                Client ID to use for this tenant, defaults to the pool's
+            client_secret : Optional[str]
+                Client secret to use for this tenant, defaults to the pool's
+
+        Raises
+            ValueError:
+                Raises if no client ID or secret is given here or to the pool
+        """
+        client_id = client_id or self._client_id
+        client_secret = client_secret or self._client_secret
+        if not client_id or not client_secret:
+            raise ValueError('A client_id and client_secret must be provided'
+                            + ' either to the pool or for the tenant')
+
+        with self._lock:
+            self._credentials[tenant_id] = (client_id, client_secret)
+
+            # Credentials changed, so drop a client made with the old ones
+            self._clients.pop(tenant_id, None)
+            self._last_used.pop(tenant_id, None)
+
+    def get_client(self, tenant_id: str) -> GraphAppClient:
+        """
+        Gets the client for a tenant, creating it if it isn't active. Tenants
+        not registered are registered with the pool's default credentials.
+
+        Parameters
+            tenant_id : str
+                Tenant ID to get the client for
+
+        Returns
+            GraphAppClient:
+                Client for the tenant, sharing the pool's transport
+        """
+        if tenant_id not in self._credentials:
+            self.register_tenant(tenant_id)
+
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            client = self._clients.get(tenant_id)
+            client_id, client_secret = self._credentials[tenant_id]
+            if client is None:
+                rate_budget, circuit_breaker = self._tenant_limits(tenant_id)
+
+        if client is None:
+            # Created outside the lock so other tenants aren't held up
+            logger.info(f'Creating client for tenant {tenant_id}')
+            client = GraphAppClient(
+                client_id,
+                tenant_id,
+                client_secret,
+                session=self.session,
+                rate_budget=rate_budget,
+                circuit_breaker=circuit_breaker,
+                **self.connector_options
+            )
+
+        with self._lock:
+            # Another thread may have created one in the meantime
+            client = self._clients.setdefault(tenant_id, client)
+            self._clients.move_to_end(tenant_id)
+            self._last_used[tenant_id] = time.monotonic()
+
+            # Evicting least recently used tenants over the bound
+            while (self.max_active_tenants is not None
+                    and len(self._clients) > self.max_active_tenants):
+                evicted_id, _ = self._clients.popitem(last=False)
+                self._last_used.pop(evicted_id, None)
+                logger.info(f'Evicted client for tenant {evicted_id}')
+
+            return client
+
+    def submit(self, tenant_id: str, fn: Callable[..., Any], *args,
+                **kwargs) -> Future:
+        """
+        Runs a function with a tenant's client on the shared thread pool
+
+        Parameters
+            tenant_id : str
+                Tenant ID whose client is passed to fn
+            fn : Callable[..., Any]
+                Function called as fn(client, *args, **kwargs)
+
+        Returns
+            Future:
+                Future for the result of fn
+        """
+        client = self.get_client(tenant_id)
+        return self.executor.submit(fn, client, *args, **kwargs)
+
+    def evict(self, tenant_id: str) -> bool:
+        """
+        Evicts a tenant's client, dropping its token cache. The tenant stays
+        registered and a new client is created on next use.
+
+        Parameters
+            tenant_id : str
+                Tenant ID to evict
+
+        Returns
+            bool:
+                Indicates whether the tenant had an active client
+        """
+        with self._lock:
+            self._last_used.pop(tenant_id, None)
+            return self._clients.pop(tenant_id, None) is not None
+
+    def active_tenants(self) -> List[str]:
+        """
+        Returns
+            List[str]:
+                Tenant IDs with an active client, least recently used first
+        """
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            return list(self._clients)
+
+    def close(self):
+        """
+        Evicts every client, shuts down the thread pool and closes the shared
+        session's connections
+        """
+        with self._lock:
+            self._clients.clear()
+            self._last_used.clear()
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.session.close()
+
+    def _tenant_limits(self, tenant_id: str) -> Tuple[Optional[RateBudget],
+                                                    Optional[CircuitBreaker]]:
+        """
+        Gets a tenant's rate budget and circuit breaker, creating them on first
+        use. Must be called with the lock held.
+
+        Parameters
+            tenant_id : str
+                Tenant ID to get them for
+
+        Returns
+            Tuple[Optional[RateBudget], Optional[CircuitBreaker]]:
+                The tenant's rate budget and circuit breaker, None for those
+                not configured
+        """
+        if self.requests_per_second and tenant_id not in self._rate_budgets:
+            self._rate_budgets[tenant_id] = RateBudget(self.requests_per_second)
+        if self.circuit_breaker_factory and tenant_id not in self._circuit_breakers:
+            self._circuit_breakers[tenant_id] = self.circuit_breaker_factory()
+
+        return (self._rate_budgets.get(tenant_id),
+                self._circuit_breakers.get(tenant_id))
+
+    def _evict_idle(self, now: float):
+        """
+        Evicts clients unused for longer than idle_timeout. Must be called with
+        the lock held.
+
+        Parameters
+            now : float
+                Current time.monotonic() value
+        """
+        if self.idle_timeout is None:
+            return
+
+        # Clients are in least recently used order, so stop at the first active
+        for tenant_id in list(self._clients):
+            if now - self._last_used[tenant_id] <= self.idle_timeout:
+                break
+            del self._clients[tenant_id]
+            del self._last_used[tenant_id]
+            logger.info(f'Evicted idle client for tenant {tenant_id}')
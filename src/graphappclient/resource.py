@@ -0,0 +1,854 @@
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import (COUNT_ODATA, COUNT_QUERY, CONSISTENCY_LEVEL_HEADER,
+                                    DEFAULT_PAGE_CACHE_SIZE, MAX_BATCH_SIZE,
+                                    NEXT_ODATA, RETRY_AFTER, RETRY_BACKOFF,
+                                    TOP_QUERY, TRANSIENT_STATUS_CODES, VALUE)
+from graphappclient.utils import APIBase, Paginator, map_pages
+from http import HTTPStatus
+from itertools import islice
+import logging
+import time
+from urllib.parse import quote
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Endpoint for JSON batch requests
+BATCH_ENDPOINT = '/$batch'
+
+class CreationResult:
+    """
+    Result of creating one resource with CollectionResource.create_many
+
+    Attributes
+        index(int): Position of the data in the iterable provided
+        data(dict): Data that was provided
+        resource(Resource): The resource created, None if creation failed
+        error(str): Why creation failed, None if it succeeded
+    """
+
+    def __init__(
+        self,
+        index: int,
+        data: dict,
+        resource: Optional['Resource'] = None,
+        error: Optional[str] = None
+    ):
+        self.index = index
+        self.data = data
+        self.resource = resource
+        self.error = error
+
+    def __repr__(self):
+        if self.success:
+            return f'Created {self.resource} from record {self.index}'
+        return f'Failed to create record {self.index}: {self.error}'
+
+    @property
+    def success(self) -> bool:
+        return self.resource is not None
+
+
+class Resource(APIBase):
+    """
+    Base class for Graph API resources, such as users. Subclasses declare
+    their endpoint and fields, and every get, update and delete goes through
+    the methods here. Resources listed and created through a collection of
+    their own inherit CollectionResource instead.
+
+    Subclasses set these class attributes
+        _name(str): Name of one resource, used in log messages
+        _plural(str): Name of many resources, used in log messages
+        _collection(str): Endpoint the resource's own endpoint is under, such
+            as '/users'
+        _fields(dict): Attribute names mapped to the JSON keys they are read
+            from
+        _json_attribute(str): Attribute the resource's JSON is kept in
+        _default_select(str): $select query the selected fields are added to
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and
+            makes API calls
+    """
+
+    _name = 'resource'
+    _plural = 'resources'
+    _collection = None
+    _fields = {}
+    _json_attribute = 'resource_json'
+    _default_select = None
+
+    def __init__(self, api_connector: APIConnector, resource_json: dict):
+        """
+        Initializes a Resource object from its JSON
+
+        Parameters
+            api_connector(APIConnector): Object used for managing authentication and
+                API calls
+            resource_json(dict): Representation of the resource's JSON object
+                to be used in construction of object
+        """
+
+        # Super class constructor
+        super().__init__()
+
+        self.graph_connector = api_connector
+        self._load(resource_json)
+
+    def _load(self, resource_json: dict):
+        """
+        Sets the attributes declared in _fields from the resource's JSON
+
+        Parameters
+            resource_json : dict
+                Representation of the resource's JSON object
+        """
+        for attribute, key in self._fields.items():
+            setattr(self, attribute, resource_json.get(key))
+        setattr(self, self._json_attribute, resource_json)
+
+    @classmethod
+    def item_endpoint(cls, resource_id: str) -> str:
+        """
+        Parameters
+            resource_id : str
+                ID of the resource
+
+        Returns
+            str:
+                Endpoint of one resource in the collection
+        """
+        return f'{cls._collection}/{resource_id}'
+
+    def _endpoint(self) -> str:
+        """
+        Returns
+            str:
+                Endpoint of this resource
+        """
+        return self.item_endpoint(self.id)
+
+    @classmethod
+    def get(
+        cls,
+        api_connector: APIConnector,
+        resource_id: str,
+        select: Optional[List[str]] = None
+    ) -> Union['Resource', None]:
+        """
+        Gets one resource from the collection
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            resource_id : str
+                ID (or other key the endpoint accepts) of the resource
+            select : Optional[List[str]]
+                Additional properties to request from Microsoft
+
+        Returns
+            Union[Resource, None]:
+                The resource if found, None otherwise
+        """
+        graph_api_url = cls._build_list_url(cls.item_endpoint(resource_id),
+                                            select=select)
+
+        # Make API call
+        response = api_connector.get(graph_api_url)
+        if not cls._check_response(response, HTTPStatus.OK,
+                                f'getting {cls._name} from Graph API'):
+            return None
+
+        return cls(api_connector, response.json())
+
+    def update(self, updates: dict) -> bool:
+        """
+        Updates this resource in Microsoft. If Microsoft returns the updated
+        resource, the attributes are refreshed from it
+
+        Parameters
+            updates : dict
+                dict representing JSON that would be sent in request body of
+                Graph API call
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        graph_api_url = self.build_url(self._endpoint())
+
+        # Make API call
+        response = self.graph_connector.patch(graph_api_url, json=updates)
+        if response.status_code == HTTPStatus.OK and response.content:
+            self._load(response.json())
+            return True
+
+        return self._check_response(response, HTTPStatus.NO_CONTENT,
+                                    f'updating {self._name} via Graph API')
+
+    def delete(self) -> bool:
+        """
+        Deletes this resource from Microsoft
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        graph_api_url = self.build_url(self._endpoint())
+
+        # Make API call
+        response = self.graph_connector.delete(graph_api_url)
+        return self._check_response(response, HTTPStatus.NO_CONTENT,
+                                    f'deleting {self._name} via Graph API')
+
+    @classmethod
+    def _build_url(cls, endpoint: str) -> str:
+        return f'{cls.base_url}{endpoint}'
+
+    @classmethod
+    def _build_list_url(
+        cls,
+        endpoint: Optional[str] = None,
+        page_size: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        count: bool = False
+    ) -> str:
+        """
+        Builds the URL to GET resources from, with its query parameters
+
+        Parameters
+            endpoint : Optional[str]
+                Endpoint to GET from, defaults to the collection
+            page_size : Optional[int]
+                Size of each page of data
+            select : Optional[List[str]]
+                Properties added to the default $select
+            count : bool
+                Requests the total number of resources with $count
+
+        Returns
+            str:
+                String representation of the url for API call
+        """
+        graph_api_url = cls._build_url(endpoint or cls._collection)
+
+        query = []
+        # Checking for page size request
+        if page_size != None:
+            query.append(f'{TOP_QUERY}{page_size}')
+
+        # Checking for select parameters
+        if select != None:
+            if cls._default_select:
+                query.append(','.join([cls._default_select] + select))
+            else:
+                query.append('$select=' + ','.join(select))
+
+        # Checking for count request
+        if count:
+            query.append(COUNT_QUERY)
+
+        if query:
+            graph_api_url = f'{graph_api_url}?{"&".join(query)}'
+        return graph_api_url
+
+    @staticmethod
+    def _check_response(response: 'Response', expected: int, action: str) -> bool:
+        """
+        Checks a response has the expected status, logging it if not
+
+        Parameters
+            response : Response
+                Response of the Graph API call
+            expected : int
+                HTTP status expected on success
+            action : str
+                What was being done, for the log message
+
+        Returns
+            bool:
+                Indicates whether the status was as expected
+        """
+        if response.status_code == expected:
+            return True
+
+        logger.error(f'Error when {action}')
+        logger.error(response.content)
+        return False
+
+    @staticmethod
+    def _retry_after(headers: dict, attempt: int) -> float:
+        """
+        Gets seconds to wait before retrying, from the Retry-After header if
+        Microsoft sent one and otherwise backing off exponentially
+
+        Parameters
+            headers : dict
+                Headers of the throttled response
+            attempt : int
+                Number of attempts made before this one
+        """
+        try:
+            return float(headers.get(RETRY_AFTER))
+        except (TypeError, ValueError):
+            return RETRY_BACKOFF * 2 ** attempt
+
+
+class CollectionResource(Resource):
+    """
+    Base class for resources listed and created through a collection of their
+    own, such as '/users'. Every list, create and bulk create goes through the
+    methods here, so paging, caching, batching, retries and streaming work the
+    same way for every such resource.
+
+    Subclasses also set these class attributes
+        _required_fields(List[str]): JSON keys required to create a resource
+        _creation_result(type): CreationResult class made by create_many
+        _lookup_field(str): JSON key the resource can be got by, used to check
+            whether a create request that failed mid-flight was applied
+    """
+
+    _required_fields = []
+    _creation_result = CreationResult
+    _lookup_field = None
+
+    @classmethod
+    def list(
+        cls,
+        api_connector: APIConnector,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        count: bool = False,
+        max_cached_pages: Optional[int] = DEFAULT_PAGE_CACHE_SIZE,
+        spill_to_disk: bool = False,
+        endpoint: Optional[str] = None
+    ) -> Union[List['Resource'], Paginator, None]:
+        """
+        Gets resources from the collection, or from another endpoint that lists
+        resources of this type
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Additional properties to request from Microsoft
+            count : bool
+                Requests the total number of resources with $count
+            max_cached_pages : Optional[int]
+                Max pages a returned Paginator holds in memory
+            spill_to_disk : bool
+                If True, a returned Paginator writes evicted pages to disk
+            endpoint : Optional[str]
+                Endpoint to list from, defaults to the collection
+
+        Returns
+            Union[List[Resource], Paginator, None]:
+                A list or Pagination of resources if found, otherwise None
+        """
+        graph_api_url = cls._build_list_url(endpoint, page_size, select, count)
+        headers = CONSISTENCY_LEVEL_HEADER if count else None
+
+        # Make API call
+        response = api_connector.get(graph_api_url, headers=headers)
+        if not cls._check_response(response, HTTPStatus.OK,
+                                f'getting {cls._plural} from Graph API'):
+            return None
+
+        response_data = response.json()
+
+        # Gets list of JSON's
+        json_list = response_data.get(VALUE) or []
+
+        # Checking limit
+        limit_reached = False
+        if limit and len(json_list) >= limit:
+            json_list = json_list[:limit]
+            limit_reached = True
+
+        resources = [cls(api_connector, resource_json) for resource_json in json_list]
+
+        if NEXT_ODATA not in response_data or limit_reached:
+            return resources
+        else: # time for pagination
+            return Paginator(
+                api_connector,
+                resources,
+                response_data.get(NEXT_ODATA),
+                cls,
+                limit=limit,
+                count=response_data.get(COUNT_ODATA),
+                headers=headers,
+                max_cached_pages=max_cached_pages,
+                spill_to_disk=spill_to_disk
+            )
+
+    @classmethod
+    def map(
+        cls,
+        api_connector: APIConnector,
+        mapper: Callable[[dict], Any],
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        processes: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        endpoint: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Walks every resource in the collection, decoding pages and applying
+        mapper to each resource's JSON in a process pool. See map_pages.
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            mapper : Callable[[dict], Any]
+                Picklable function applied to each resource's JSON
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Additional properties to request from Microsoft
+            processes : Optional[int]
+                Processes in the pool, defaults to one per CPU
+            executor : Optional[Executor]
+                Pool to use instead of creating one, so it can be reused
+            endpoint : Optional[str]
+                Endpoint to list from, defaults to the collection
+
+        Returns
+            Iterator[Any]:
+                mapper's result for each resource
+        """
+        return map_pages(
+            api_connector,
+            cls._build_list_url(endpoint, page_size, select),
+            mapper,
+            limit=limit,
+            processes=processes,
+            executor=executor
+        )
+
+    @classmethod
+    def create(cls, api_connector: APIConnector, data: dict) -> Union['Resource', None]:
+        """
+        Creates a resource in the collection
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            data : dict
+                dictionary representing the JSON to be POST'd to Microsoft
+
+        Returns
+            Union[Resource, None]:
+                The resource created, or None if it could not be created
+
+        Raises
+            ValueError:
+                Raises if required fields aren't all present in data
+        """
+        # Checking if required data is in provided JSON for POST
+        cls.validate(data)
+
+        # Build URL for HTTP request
+        graph_api_url = cls._build_url(cls._collection)
+
+        # Make POST request
+        response = api_connector.post(graph_api_url, data)
+        if not cls._check_response(response, HTTPStatus.CREATED,
+                                f'creating {cls._name} in Graph API'):
+            return None
+
+        return cls(api_connector, response.json())
+
+    @classmethod
+    def create_many(
+        cls,
+        api_connector: APIConnector,
+        records: Iterable[dict],
+        batch_size: int = MAX_BATCH_SIZE,
+        max_in_flight: int = 4,
+        max_retries: int = 3,
+        use_batch: bool = True
+    ) -> Iterator[CreationResult]:
+        """
+        Creates many resources in the collection. Records are read as they
+        are needed, and are sent in JSON batches (or one request each if
+        use_batch is False) with at most max_in_flight requests outstanding.
+        Records are only read once there is room for them, so a slow API slows
+        the reading rather than filling memory. Throttled and failed requests
+        are retried.
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            records : Iterable[dict]
+                dictionaries representing the JSON to be POST'd to Microsoft
+            batch_size : int
+                Resources sent in each JSON batch, at most 20
+            max_in_flight : int
+                Max requests outstanding at once
+            max_retries : int
+                Times a throttled or failed request is retried
+            use_batch : bool
+                If False, each resource is sent in its own request
+
+        Returns
+            Iterator[CreationResult]:
+                A result for every record, in the order they finish. Records
+                missing required fields are reported without being sent
+
+        Raises
+            ValueError:
+                Raises if batch_size or max_in_flight are out of range
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f'batch_size must be between 1 and {MAX_BATCH_SIZE}')
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+
+        chunk_size = batch_size if use_batch else 1
+        send = cls._create_batch if use_batch else cls._create_single
+        records = enumerate(records)
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            in_flight = set()
+            exhausted = False
+            while in_flight or not exhausted:
+                # Reading records until there is no room left
+                while not exhausted and len(in_flight) < max_in_flight:
+                    chunk = []
+                    read_count = 0
+                    for index, data in islice(records, chunk_size):
+                        read_count += 1
+                        try:
+                            cls.validate(data)
+                        except (ValueError, TypeError) as err:
+                            yield cls._creation_result(index, data, error=str(err))
+                            continue
+                        chunk.append((index, data))
+
+                    if read_count < chunk_size:
+                        exhausted = True
+                    if chunk:
+                        in_flight.add(executor.submit(send, api_connector,
+                                                    chunk, max_retries))
+
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        yield result
+
+    @classmethod
+    def validate(cls, data: dict):
+        """
+        Checks that data has every field required to create a resource
+
+        Parameters
+            data : dict
+                dictionary representing the JSON to be POST'd to Microsoft
+
+        Raises
+            ValueError:
+                Raises if required fields aren't all present in data
+        """
+        for key in cls._required_fields:
+            if key not in data:
+                raise ValueError(f'Key "{key}" is required and was not provided'
+                                + f' in the {cls._name}_data parameter')
+
+    @classmethod
+    def _create_batch(
+        cls,
+        api_connector: APIConnector,
+        chunk: List[Tuple[int, dict]],
+        max_retries: int
+    ) -> List[CreationResult]:
+        """
+        Creates resources with JSON batch requests, retrying the ones
+        throttled or failed
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            chunk : List[Tuple[int, dict]]
+                Index and data of each resource to create
+            max_retries : int
+                Times a throttled or failed request is retried
+
+        Returns
+            List[CreationResult]:
+                A result for every resource in chunk
+        """
+        from requests import RequestException
+
+        graph_api_url = cls._build_url(BATCH_ENDPOINT)
+        results = []
+        pending = {str(index): (index, data) for index, data in chunk}
+        ambiguous = set() # request IDs that may have been applied
+
+        for attempt in range(max_retries + 1):
+            batch_json = {'requests': [{
+                'id': request_id,
+                'method': 'POST',
+                'url': cls._collection,
+                'headers': {'Content-Type': 'application/json'},
+                'body': data
+            } for request_id, (_, data) in pending.items()]}
+
+            retry_after = 0
+            try:
+                response = api_connector.post(graph_api_url, batch_json)
+            except RequestException as err:
+                error = str(err)
+                retry_after = None
+                if not cls._is_connect_error(err):
+                    ambiguous.update(pending)
+                    cls._settle_applied(api_connector, pending, list(pending),
+                                        error, results)
+            else:
+                error = response.text
+                if response.status_code == HTTPStatus.OK: # Checking for 200
+                    failed = [] # request IDs that may have been applied
+                    for item in response.json().get('responses', []):
+                        request_id = item.get('id')
+                        if request_id not in pending:
+                            continue
+
+                        status = item.get('status')
+                        body = item.get('body') or {}
+                        if status == HTTPStatus.CREATED: # Checking for 201
+                            index, data = pending.pop(request_id)
+                            results.append(cls._creation_result(index, data,
+                                            cls(api_connector, body)))
+                        elif status in TRANSIENT_STATUS_CODES:
+                            error = str(body)
+                            retry_after = max(retry_after or 0, cls._retry_after(
+                                item.get('headers') or {}, attempt))
+                            if status != HTTPStatus.TOO_MANY_REQUESTS:
+                                failed.append(request_id)
+                        else:
+                            # Rejecting a resend may mean an earlier attempt
+                            # was applied
+                            index, data = pending.pop(request_id)
+                            resource = None
+                            if request_id in ambiguous:
+                                _, resource = cls._find_created(api_connector, data)
+                            results.append(cls._creation_result(index, data,
+                                    resource, None if resource else str(body)))
+
+                    ambiguous.update(failed)
+                    cls._settle_applied(api_connector, pending, failed, error,
+                                        results)
+                elif response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                    retry_after = cls._retry_after(response.headers, attempt)
+                elif response.status_code in TRANSIENT_STATUS_CODES:
+                    retry_after = cls._retry_after(response.headers, attempt)
+                    ambiguous.update(pending)
+                    cls._settle_applied(api_connector, pending, list(pending),
+                                        error, results)
+                else: # Whole batch rejected, not worth retrying
+                    break
+
+            if not pending:
+                return results
+
+            if attempt < max_retries:
+                time.sleep(retry_after if retry_after else
+                            RETRY_BACKOFF * 2 ** attempt)
+
+        # Resending may have failed because an earlier attempt was applied
+        for request_id in ambiguous.intersection(pending):
+            _, resource = cls._find_created(api_connector, pending[request_id][1])
+            if resource is not None:
+                index, data = pending.pop(request_id)
+                results.append(cls._creation_result(index, data, resource))
+        if not pending:
+            return results
+
+        logger.error(f'Error when creating {cls._plural} in Graph API')
+        logger.error(error)
+        for index, data in pending.values():
+            results.append(cls._creation_result(index, data, error=str(error)))
+        return results
+
+    @classmethod
+    def _settle_applied(
+        cls,
+        api_connector: APIConnector,
+        pending: Dict[str, Tuple[int, dict]],
+        request_ids: List[str],
+        error: str,
+        results: List[CreationResult]
+    ):
+        """
+        Looks up the resources of batch requests that failed after they may
+        have been applied. Those found are reported as created, and those that
+        can't be looked up as failed, so only the ones known not to exist are
+        left pending to be sent again.
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            pending : Dict[str, Tuple[int, dict]]
+                Index and data of each resource still to create, by request ID
+            request_ids : List[str]
+                IDs of the requests that may have been applied
+            error : str
+                Error reported for resources that can't be looked up
+            results : List[CreationResult]
+                Results the settled resources are added to
+        """
+        for request_id in request_ids:
+            index, data = pending[request_id]
+            known, resource = cls._find_created(api_connector, data)
+            if resource is not None or not known:
+                pending.pop(request_id)
+                results.append(cls._creation_result(index, data, resource,
+                                                    None if resource else error))
+
+    @classmethod
+    def _create_single(
+        cls,
+        api_connector: APIConnector,
+        chunk: List[Tuple[int, dict]],
+        max_retries: int
+    ) -> List[CreationResult]:
+        """
+        Creates a resource with its own request, retrying it if throttled or
+        failed
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            chunk : List[Tuple[int, dict]]
+                Index and data of the resource to create
+            max_retries : int
+                Times a throttled or failed request is retried
+
+        Returns
+            List[CreationResult]:
+                The result for the resource
+        """
+        from requests import RequestException
+
+        index, data = chunk[0]
+        graph_api_url = cls._build_url(cls._collection)
+        ambiguous = False # whether an attempt may have been applied
+
+        for attempt in range(max_retries + 1):
+            retry_after = None
+            try:
+                response = api_connector.post(graph_api_url, data)
+            except RequestException as err:
+                error = str(err)
+                applied = not cls._is_connect_error(err)
+            else:
+                if response.status_code == HTTPStatus.CREATED: # Checking for 201
+                    return [cls._creation_result(index, data,
+                            cls(api_connector, response.json()))]
+
+                error = response.text
+                if response.status_code not in TRANSIENT_STATUS_CODES:
+                    break
+                retry_after = cls._retry_after(response.headers, attempt)
+                # Only throttled requests are known not to have been applied
+                applied = response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+
+            if applied:
+                # The request may have been applied, so checking before
+                # sending it again
+                ambiguous = True
+                known, resource = cls._find_created(api_connector, data)
+                if resource is not None:
+                    return [cls._creation_result(index, data, resource)]
+                if not known:
+                    break
+
+            if attempt < max_retries:
+                time.sleep(retry_after if retry_after else
+                            RETRY_BACKOFF * 2 ** attempt)
+
+        # Resending may have failed because an earlier attempt was applied
+        if ambiguous:
+            _, resource = cls._find_created(api_connector, data)
+            if resource is not None:
+                return [cls._creation_result(index, data, resource)]
+
+        logger.error(f'Error when creating {cls._name} in Graph API')
+        logger.error(error)
+        return [cls._creation_result(index, data, error=str(error))]
+
+    @classmethod
+    def _find_created(
+        cls,
+        api_connector: APIConnector,
+        data: dict
+    ) -> Tuple[bool, Optional['Resource']]:
+        """
+        Looks up a resource whose create request failed after it was sent, by
+        its _lookup_field, to find out whether the request was applied
+
+        Parameters
+            api_connector : APIConnector
+                Manages access tokens and makes API calls
+            data : dict
+                dictionary representing the JSON that was POST'd to Microsoft
+
+        Returns
+            Tuple[bool, Optional[Resource]]:
+                Whether it is known if the resource exists, and the resource
+                if it does
+        """
+        from requests import RequestException
+
+        if cls._lookup_field is None or not data.get(cls._lookup_field):
+            return False, None
+
+        graph_api_url = cls._build_url(cls.item_endpoint(
+            quote(str(data[cls._lookup_field]), safe='@')))
+        try:
+            response = api_connector.get(graph_api_url)
+        except RequestException:
+            return False, None
+
+        if response.status_code == HTTPStatus.OK: # Checking for 200
+            return True, cls(api_connector, response.json())
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return True, None
+        return False, None
+
+    @staticmethod
+    def _is_connect_error(error: Exception) -> bool:
+        """
+        Checks whether a request failed while connecting, before anything was
+        sent, so it is safe to send again even if it isn't idempotent
+
+        Parameters
+            error : Exception
+                Error raised by the request
+        """
+        from requests import ConnectTimeout
+        from urllib3.exceptions import NewConnectionError
+
+        if isinstance(error, ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta, timezone
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import (CHANGE_TYPE, CLIENT_STATE, EXPIRATION_DATE_TIME,
+                                    ID, MAX_USER_SUBSCRIPTION_MINUTES,
+                                    NOTIFICATION_URL, RESOURCE)
+from graphappclient.resource import CollectionResource
+import logging
+import threading
+from typing import Optional, Union
+
+# Logger
+logger = logging.getLogger(__name__)
+
+def format_date_time(value: datetime) -> str:
+    """
+    Formats a datetime the way the Graph API expects, in UTC
+
+    Parameters
+        value : datetime
+            Datetime to format, naive datetimes are taken to be UTC
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def parse_date_time(value: Optional[str]) -> Union[datetime, None]:
+    """
+    Parses a datetime returned by the Graph API, which can have more
+    fractional second digits than datetime supports
+
+    Parameters
+        value : Optional[str]
+            Datetime string such as '2022-09-01T11:00:00.0000000Z'
+    """
+    if not value:
+        return None
+
+    value = value.rstrip('Z')
+    if '.' in value:
+        value, fraction = value.split('.', 1)
+        value = f'{value}.{fraction[:6]}'
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+class Subscription(CollectionResource):
+    """
+    Class representing a change notification subscription. Microsoft sends
+    notifications to the notification URL when the subscribed resource
+    changes, until the subscription expires. More info found here:
+    https://docs.microsoft.com/en-us/graph/api/resources/subscription
+
+    Attributes
+        graph_connector(APIConnector): Manages access tokens and
+            makes API calls
+        id(str): Subscription's unique Microsoft ID
+        resource(str): Resource being watched, such as '/users'
+        change_type(str): Changes notified, such as 'updated,deleted'
+        notification_url(str): URL notifications are sent to
+        expiration_date_time(datetime): When the subscription expires
+        client_state(str): Secret sent with each notification to prove it
+            came from Microsoft
+        subscription_json(dict): JSON representation of the Subscription object
+    """
+
+    _name = 'subscription'
+    _plural = 'subscriptions'
+    _collection = '/subscriptions'
+    _fields = {
+        'id' : ID,
+        'resource' : RESOURCE,
+        'change_type' : CHANGE_TYPE,
+        'notification_url' : NOTIFICATION_URL,
+        'expiration_date_time' : EXPIRATION_DATE_TIME,
+        'client_state' : CLIENT_STATE
+    }
+    _json_attribute = 'subscription_json'
+    _required_fields = [CHANGE_TYPE, NOTIFICATION_URL, RESOURCE,
+                        EXPIRATION_DATE_TIME]
+
+    def __init__(self, api_connector: APIConnector, subscription_json: dict):
+        """
+        Initializes a Subscription object.
+
+        Parameters
+            api_connector(APIConnector): Object used for managing authentication and
+                API calls
+            subscription_json(dict): Representation of Subscription JSON object
+                to be used in construction of object
+        """
+
+        self.client_state = None
+        self._auto_renewing = False
+        self._renew_timer = None
+        self._renew_lock = threading.Lock()
+
+        # Super class constructor
+        super().__init__(api_connector, subscription_json)
+
+    def _load(self, subscription_json: dict):
+        # Microsoft doesn't return the client state, so keeping what was sent
+        client_state = self.client_state
+        super()._load(subscription_json)
+        self.expiration_date_time = parse_date_time(self.expiration_date_time)
+        if self.client_state is None:
+            self.client_state = client_state
+
+    def __repr__(self):
+        return (f'Subscription {self.id} to {self.resource} expiring '
+                + f'{self.expiration_date_time}')
+
+    def renew(self, expiration: Optional[datetime] = None) -> bool:
+        """
+        Extends this subscription in Microsoft
+
+        Parameters
+            expiration : Optional[datetime]
+                New expiration, defaults to the longest Microsoft allows for
+                subscriptions to users
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        if expiration is None:
+            expiration = datetime.now(timezone.utc) + timedelta(
+                minutes=MAX_USER_SUBSCRIPTION_MINUTES - 1)
+
+        return self.update({EXPIRATION_DATE_TIME: format_date_time(expiration)})
+
+    def delete(self) -> bool:
+        """
+        Deletes this subscription from Microsoft, stopping notifications and
+        any auto renewal
+
+        Returns
+            bool:
+                Indicates the success of the operation
+        """
+        self.stop_auto_renew()
+        return super().delete()
+
+    def start_auto_renew(
+        self,
+        renew_before: timedelta = timedelta(hours=1),
+        retry_interval: timedelta = timedelta(minutes=1)
+    ):
+        """
+        Renews this subscription in a background thread renew_before its
+        expiration, for as long as it isn't deleted or stopped. Failed renewals
+        are tried again every retry_interval.
+
+        Parameters
+            renew_before : timedelta
+                How long before expiration to renew
+            retry_interval : timedelta
+                How long to wait before trying a failed renewal again
+        """
+        self._renew_before = renew_before
+        self._retry_interval = retry_interval
+        with self._renew_lock:
+            self._auto_renewing = True
+        self._schedule_renew(self._seconds_until_renew())
+
+    def stop_auto_renew(self):
+        """
+        Stops auto renewal of this subscription
+        """
+        with self._renew_lock:
+            self._auto_renewing = False
+            if self._renew_timer is not None:
+                self._renew_timer.cancel()
+                self._renew_timer = None
+
+    def _seconds_until_renew(self) -> float:
+        if self.expiration_date_time is None:
+            return 0
+        renew_at = self.expiration_date_time - self._renew_before
+        return max(0, (renew_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _schedule_renew(self, delay: float):
+        with self._renew_lock:
+            if not self._auto_renewing: # stopped
+                return
+            if self._renew_timer is not None:
+                self._renew_timer.cancel()
+            self._renew_timer = threading.Timer(delay, self._auto_renew)
+            self._renew_timer.daemon = True
+            self._renew_timer.start()
+
+    def _auto_renew(self):
+        with self._renew_lock:
+            if not self._auto_renewing: # stopped
+                return
+
+        if self.renew():
+            logger.info(f'Renewed subscription {self.id} until '
+                        + f'{self.expiration_date_time}')
+            self._schedule_renew(self._seconds_until_renew())
+        else:
+            self._schedule_renew(self._retry_interval.total_seconds())
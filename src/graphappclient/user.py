@@ -1,18 +1,38 @@
-from unittest.mock import patch
 from graphappclient.api_connector import APIConnector
-from graphappclient.constants import (BUSINESS_PHONES, DISPLAY_NAME, GIVEN_NAME, ID,
-                                    JOB_TITLE, MAIL, MOBILE_PHONE, OFFICE_LOCATION,
-                                    PREFERRED_LANGUAGE, SURNAME, USER_PRINCIPAL_NAME,
-                                    VALUE)
-from graphappclient.utils import APIBase
-from http import HTTPStatus
+from graphappclient.constants import (BUSINESS_PHONES, DEFAULT_USER_SELECT, DISPLAY_NAME,
+                                    GIVEN_NAME, ID, JOB_TITLE, MAIL, MOBILE_PHONE,
+                                    OFFICE_LOCATION, PREFERRED_LANGUAGE,
+                                    REQUIRED_USER_KEYS, SURNAME, USER_PRINCIPAL_NAME)
+from graphappclient.group import Group
+from graphappclient.resource import CollectionResource, CreationResult
+from graphappclient.utils import Paginator
 import logging
-from typing import List, Optional
+from typing import List, Optional, Union
 
 # Logger
 logger = logging.getLogger(__name__)
 
-class User(APIBase):
+class UserCreationResult(CreationResult):
+    """
+    Result of creating one user with GraphAppClient.create_users
+
+    Attributes
+        index(int): Position of the user data in the iterable provided
+        user_data(dict): User data that was provided
+        user(User): The User created, None if creation failed
+        error(str): Why creation failed, None if it succeeded
+    """
+
+    @property
+    def user(self) -> Optional['User']:
+        return self.resource
+
+    @property
+    def user_data(self) -> dict:
+        return self.data
+
+
+class User(CollectionResource):
     """
     Class representing a user object for Microsoft. More info found here:
     https://docs.microsoft.com/en-us/graph/api/resources/user
@@ -34,13 +54,35 @@ class User(APIBase):
         user_json(dict): JSON representation of the User object
     """
 
-    DELETE_USER = 'delete_user'
-    UPDATE_USER = 'update_user'
+    MEMBER_OF = 'member_of'
+    TRANSITIVE_MEMBER_OF = 'transitive_member_of'
 
     _endpoints = {
-        DELETE_USER : '/users/{id}',
-        UPDATE_USER : '/users/{id}'
+        MEMBER_OF : '/users/{id}/memberOf/microsoft.graph.group',
+        TRANSITIVE_MEMBER_OF : '/users/{id}/transitiveMemberOf/microsoft.graph.group'
+    }
+
+    _name = 'user'
+    _plural = 'users'
+    _collection = '/users'
+    _fields = {
+        'business_phones' : BUSINESS_PHONES,
+        'display_name' : DISPLAY_NAME,
+        'given_name' : GIVEN_NAME,
+        'job_title' : JOB_TITLE,
+        'mail' : MAIL,
+        'mobile_phone' : MOBILE_PHONE,
+        'office_location' : OFFICE_LOCATION,
+        'preferred_language' : PREFERRED_LANGUAGE,
+        'surname' : SURNAME,
+        'user_principal_name' : USER_PRINCIPAL_NAME,
+        'id' : ID
     }
+    _json_attribute = 'user_json'
+    _default_select = DEFAULT_USER_SELECT
+    _required_fields = REQUIRED_USER_KEYS
+    _creation_result = UserCreationResult
+    _lookup_field = USER_PRINCIPAL_NAME
 
     def __init__(self, api_connector: APIConnector, user_json: dict):
         """
@@ -54,21 +96,7 @@ class User(APIBase):
         """
 
         # Super class constructor
-        super().__init__()
-
-        self.graph_connector = api_connector
-        self.business_phones = user_json.get(BUSINESS_PHONES)
-        self.display_name = user_json.get(DISPLAY_NAME)
-        self.given_name = user_json.get(GIVEN_NAME)
-        self.job_title = user_json.get(JOB_TITLE)
-        self.mail = user_json.get(MAIL)
-        self.mobile_phone = user_json.get(MOBILE_PHONE)
-        self.office_location = user_json.get(OFFICE_LOCATION)
-        self.preferred_language = user_json.get(PREFERRED_LANGUAGE)
-        self.surname = user_json.get(SURNAME)
-        self.user_principal_name = user_json.get(USER_PRINCIPAL_NAME)
-        self.id = user_json.get(ID)
-        self.user_json = user_json
+        super().__init__(api_connector, user_json)
     
     def __repr__(self):
         return f'User {self.user_principal_name} with ID {self.id}'
@@ -82,18 +110,7 @@ class User(APIBase):
             bool:
                 Indicates the success of the operation
         """
-        # Build endpoint and URL
-        user_fetch_endpoint = self._endpoints[self.DELETE_USER].format(id=self.id)
-        graph_api_url = self.build_url(user_fetch_endpoint)
-
-        # Make API call
-        response = self.graph_connector.delete(graph_api_url)
-        if not response.status_code == HTTPStatus.NO_CONTENT: # Checking for 204
-            logger.error('Error when getting user from Graph API')
-            logger.error(response.content)
-            return False
-        
-        return True
+        return self.delete()
     
     def update_user(self, updates: Optional[dict] = None, include_attributes: Optional[bool] = False) -> bool:
         """
@@ -128,30 +145,44 @@ class User(APIBase):
 
         # Updating potential attribute changes to self.user_json
         if include_attributes:
-            self.user_json[BUSINESS_PHONES] = self.business_phones
-            self.user_json[DISPLAY_NAME] = self.display_name
-            self.user_json[GIVEN_NAME] = self.given_name
-            self.user_json[JOB_TITLE] = self.job_title
-            self.user_json[MAIL] = self.mail
-            self.user_json[MOBILE_PHONE] = self.mobile_phone
-            self.user_json[OFFICE_LOCATION] = self.office_location
-            self.user_json[PREFERRED_LANGUAGE] = self.preferred_language
-            self.user_json[SURNAME] = self.surname
-            self.user_json[USER_PRINCIPAL_NAME] = self.user_principal_name
-            self.user_json[ID] = self.id
+            for attribute, key in self._fields.items():
+                self.user_json[key] = getattr(self, attribute)
         
         # Getting JSON to patch to MS
         patch_json = self.user_json if include_attributes else updates
 
-        # Build endpoint and URL
-        user_fetch_endpoint = self._endpoints[self.UPDATE_USER].format(id=self.id)
-        graph_api_url = self.build_url(user_fetch_endpoint)
+        return self.update(patch_json)
+    
+    def get_member_of(
+        self,
+        transitive: bool = False,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> Union[List[Group], Paginator, None]:
+        """
+        Gets the groups this user is a member of
 
-        # Make API call
-        response = self.graph_connector.patch(graph_api_url, json=patch_json)
-        if not response.status_code == HTTPStatus.NO_CONTENT: # Checking for 204
-            logger.error('Error when updating user via Graph API')
-            logger.error(response.content)
-            return False
-        
-        return True
+        Parameters
+            transitive : bool
+                If True, groups the user is a member of through nested groups
+                are included
+            page_size : Optional[int]
+                Size of each page of data to be returned from Microsoft API calls
+            limit : Optional[int]
+                Limit on how much data is returned from Microsoft
+            select : Optional[List[str]]
+                Group properties to request from Microsoft
+
+        Returns
+            Union[List[Group], Paginator, None]:
+                A list or Pagination of Group objects if found, otherwise None
+        """
+        endpoint_key = self.TRANSITIVE_MEMBER_OF if transitive else self.MEMBER_OF
+        return Group.list(
+            self.graph_connector,
+            page_size=page_size,
+            limit=limit,
+            select=select,
+            endpoint=self._endpoints[endpoint_key].format(id=self.id)
+        )
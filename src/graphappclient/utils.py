@@ -1,9 +1,18 @@
 from graphappclient.api_connector import APIConnector
-from graphappclient.constants import (API_VERSION, GRAPH_BASE_URL, NEXT_ODATA,
-                                    VALUE)
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from graphappclient.constants import (API_VERSION, DEFAULT_PAGE_CACHE_SIZE,
+                                    GRAPH_BASE_URL, NEXT_ODATA, VALUE)
 from http import HTTPStatus
+import json
 import logging
-from typing import Any, List
+import os
+import re
+from tempfile import TemporaryDirectory
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional, Union
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -17,17 +26,15 @@ class APIBase:
         base_url(str): Base URL for Graph API calls
     """
 
+    # Shared by every instance, as it is the same for all of them
+    base_url = f'{GRAPH_BASE_URL}{API_VERSION}'
+
     def __init__(self):
         """
         Initializes APIBase object. This will be inherited by any class that
         makes Graph API calls, and holds some utilities that all of them will
         need.
         """
-
-        self.base_url = self._build_base_url(
-            GRAPH_BASE_URL,
-            API_VERSION
-        )
     
     def _build_base_url(self, url: str, ver: str) -> str:
         """
@@ -60,13 +67,450 @@ class APIBase:
         return f'{self.base_url}{endpoint}'
 
 
+def map_pages(
+    api_connector: APIConnector,
+    url: str,
+    mapper: Callable[[dict], Any],
+    limit: Optional[int] = None,
+    headers: Optional[dict] = None,
+    processes: Optional[int] = None,
+    max_pending_pages: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Iterator[Any]:
+    """
+    Walks every page of a collection, decoding pages and applying mapper to
+    each entry in a process pool so the work isn't held to one core by the
+    GIL. The raw bytes of each page are sent to the pool while the next page is
+    requested, and results are yielded in the order of the collection. No
+    more pages are requested than limit needs. Next page links outside the
+    Graph API are refused, ending the walk.
+
+    Parameters
+        api_connector : APIConnector
+            Manages access tokens and makes API calls
+        url : str
+            URL to GET the first page from
+        mapper : Callable[[dict], Any]
+            Function applied to the JSON of each entry. It's run in other
+            processes, so it and its results must be picklable (e.g. defined
+            at module level)
+        limit : Optional[int]
+            Max total entries to be returned
+        headers : Optional[dict]
+            Extra headers to send when requesting pages
+        processes : Optional[int]
+            Processes in the pool, defaults to one per CPU
+        max_pending_pages : Optional[int]
+            Max pages fetched but not yet yielded, defaults to twice the number
+            of processes
+        executor : Optional[Executor]
+            Pool to use instead of creating one, so it can be reused across
+            walks
+
+    Returns
+        Iterator[Any]:
+            mapper's result for each entry
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=processes)
+    if max_pending_pages is None:
+        max_pending_pages = 2 * (processes or os.cpu_count() or 1)
+
+    pending = deque()
+    yielded = 0
+    largest_page = None # most entries seen on one page
+
+    def fetched_enough() -> bool:
+        # Pages still decoding are guessed to be as large as the largest seen,
+        # and only waited for when the guess reaches limit, so prefetching
+        # isn't held up until the last pages
+        nonlocal largest_page
+        if limit is None:
+            return False
+
+        sizes = [len(future.result()) for future in pending if future.done()]
+        decoding = len(pending) - len(sizes)
+        largest = max(sizes + [largest_page or 0])
+        if decoding and (largest_page is None and not sizes
+                        or yielded + sum(sizes) + decoding * largest >= limit):
+            sizes = [len(future.result()) for future in pending]
+        if sizes:
+            largest_page = max(sizes + [largest_page or 0])
+        return yielded + sum(sizes) >= limit
+
+    try:
+        while url or pending:
+            # Requesting pages until enough are waiting on the pool, or
+            # enough entries have been fetched to reach limit
+            while url and len(pending) < max_pending_pages and not fetched_enough():
+                response = api_connector.get(url, headers=headers)
+                if not response.status_code == HTTPStatus.OK: # Checking for 200
+                    logger.error('Error when getting next page from Graph API')
+                    logger.error(response.content)
+                    url = None
+                    break
+
+                content = response.content
+                url = _find_next_link(content)
+                if url and not url.startswith(f'{APIBase.base_url}/'):
+                    # Pages come with a token, so only the Graph API gets them
+                    logger.error('Refusing next page link outside the Graph API')
+                    url = None
+                pending.append(executor.submit(_decode_page, content, mapper))
+
+            if not pending:
+                break
+
+            for result in pending.popleft().result():
+                if limit is not None and yielded >= limit:
+                    return
+                yield result
+                yielded += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _decode_page(content: bytes, mapper: Callable[[dict], Any]) -> List[Any]:
+    """
+    Decodes a page of a collection and applies mapper to each entry, run in
+    map_pages' process pool
+
+    Parameters
+        content : bytes
+            Raw response body of the page
+        mapper : Callable[[dict], Any]
+            Function applied to the JSON of each entry
+
+    Returns
+        List[Any]:
+            mapper's result for each entry
+    """
+    return [mapper(item) for item in json.loads(content).get(VALUE, [])]
+
+
+def _find_next_link(content: bytes) -> Union[str, None]:
+    """
+    Finds the next page URL in a page's raw response body. Only members of the
+    top-level object are read, those before "value" from the start and the
+    last one from the end, where Microsoft puts the link, so the entries don't
+    need decoding. If the link isn't found there the whole page is decoded.
+
+    Parameters
+        content : bytes
+            Raw response body of the page
+
+    Returns
+        Union[str, None]:
+            URL to GET for next page of data, None if there isn't one
+    """
+    text = content.decode('utf-8')
+    decoder = json.JSONDecoder()
+
+    try:
+        # Members before the entries
+        pos = _skip_whitespace(text, 0)
+        if text[pos] != '{':
+            raise ValueError('Page is not a JSON object')
+        pos = _skip_whitespace(text, pos + 1)
+        while text[pos] != '}':
+            key, pos = decoder.raw_decode(text, pos)
+            pos = _skip_whitespace(text, pos)
+            if text[pos] != ':':
+                raise ValueError('Expected ":"')
+            pos = _skip_whitespace(text, pos + 1)
+            if key == VALUE:
+                break
+
+            member, pos = decoder.raw_decode(text, pos)
+            if key == NEXT_ODATA:
+                return member
+            pos = _skip_whitespace(text, pos)
+            if text[pos] == ',':
+                pos = _skip_whitespace(text, pos + 1)
+            elif text[pos] != '}':
+                raise ValueError('Expected "," or "}"')
+        else:
+            return None # no entries, nothing after them
+
+        # Last member, read backwards from the closing brace
+        next_link = _last_next_link(text)
+        if next_link is not None:
+            return next_link
+    except (ValueError, IndexError):
+        pass
+
+    # Elsewhere or missing, so decoding it all
+    return json.loads(text).get(NEXT_ODATA)
+
+
+def _last_next_link(text: str) -> Union[str, None]:
+    """
+    Reads the last member of a JSON object backwards, returning its value if
+    it is the next page URL. Quotes inside JSON strings are always escaped, so
+    the first unescaped quote before a string's end is its start.
+
+    Parameters
+        text : str
+            Page's response body
+
+    Returns
+        Union[str, None]:
+            URL to GET for next page of data, None if the last member isn't it
+    """
+    pos = _skip_whitespace_back(text, len(text) - 1)
+    if text[pos] != '}':
+        return None
+
+    value_end = _skip_whitespace_back(text, pos - 1)
+    if text[value_end] != '"':
+        return None
+    value_start = _string_start(text, value_end)
+
+    pos = _skip_whitespace_back(text, value_start - 1)
+    if text[pos] != ':':
+        return None
+
+    key_end = _skip_whitespace_back(text, pos - 1)
+    if text[key_end] != '"':
+        return None
+    key_start = _string_start(text, key_end)
+
+    if text[_skip_whitespace_back(text, key_start - 1)] not in ',{':
+        return None
+    if json.loads(text[key_start:key_end + 1]) != NEXT_ODATA:
+        return None
+    return json.loads(text[value_start:value_end + 1])
+
+
+def _string_start(text: str, end: int) -> int:
+    """
+    Finds the opening quote of the JSON string whose closing quote is at end
+    """
+    pos = end
+    while True:
+        pos = text.rindex('"', 0, pos)
+        backslashes = 0
+        while text[pos - backslashes - 1] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return pos
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _skip_whitespace_back(text: str, pos: int) -> int:
+    while pos >= 0 and text[pos] in ' \t\n\r':
+        pos -= 1
+    return pos
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class RateBudget:
+    """
+    Token bucket rate limiter used to keep API calls under a request budget.
+    It's thread safe, so one budget can be shared by every thread making calls
+    for the same tenant.
+
+    Attributes
+        rate(float): Calls allowed per second
+        burst(int): Max calls that can be made at once after being idle
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initializes RateBudget object
+
+        Parameters
+            rate : float
+                Calls allowed per second
+            burst : Optional[int]
+                Max calls that can be made at once after being idle, defaults
+                to one second's worth of calls
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes one call from the budget, blocking until one is available
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst,
+                                self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker used to stop making calls to endpoints that are failing.
+    After failure_threshold failures in a row an endpoint's circuit opens and
+    calls to it fail fast. After recovery_time seconds one trial call is let
+    through, closing the circuit if it succeeds and opening it again if not.
+    Calls slower than slow_call_threshold count as failures. It's thread
+    safe, and tracks each endpoint key separately.
+
+    Attributes
+        failure_threshold(int): Failures in a row that open a circuit
+        recovery_time(float): Seconds a circuit stays open before a trial call
+        slow_call_threshold(float): Seconds after which a successful call
+            counts as a failure, None to ignore latency
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30,
+        slow_call_threshold: Optional[float] = None
+    ):
+        """
+        Initializes CircuitBreaker object
+
+        Parameters
+            failure_threshold : int
+                Failures in a row that open a circuit
+            recovery_time : float
+                Seconds a circuit stays open before a trial call
+            slow_call_threshold : Optional[float]
+                Seconds after which a successful call counts as a failure
+        """
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.slow_call_threshold = slow_call_threshold
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def state(self, key: str) -> str:
+        """
+        Parameters
+            key : str
+                Endpoint key
+
+        Returns
+            str:
+                CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            return self._circuit(key)['state']
+
+    def allow(self, key: str) -> bool:
+        """
+        Checks whether a call to an endpoint can be made, and lets a trial call
+        through if its circuit has been open for recovery_time
+
+        Parameters
+            key : str
+                Endpoint key
+
+        Returns
+            bool:
+                Indicates whether the call can be made
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit['state'] == self.CLOSED:
+                return True
+
+            if (circuit['state'] == self.OPEN and time.monotonic()
+                    - circuit['opened_at'] >= self.recovery_time):
+                circuit['state'] = self.HALF_OPEN
+                return True # trial call
+
+            return False
+
+    def record_success(self, key: str, latency: float):
+        """
+        Records a successful call, which counts as a failure if it was slow
+
+        Parameters
+            key : str
+                Endpoint key
+            latency : float
+                Seconds the call took
+        """
+        if self.slow_call_threshold is not None and latency > self.slow_call_threshold:
+            self.record_failure(key)
+            return
+
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit['state'] = self.CLOSED
+            circuit['failures'] = 0
+
+    def record_failure(self, key: str):
+        """
+        Records a failed call, opening the circuit if there have been too many
+
+        Parameters
+            key : str
+                Endpoint key
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit['failures'] += 1
+            if (circuit['state'] == self.HALF_OPEN
+                    or circuit['failures'] >= self.failure_threshold):
+                if circuit['state'] != self.OPEN:
+                    logger.warning(f'Circuit opened for endpoint {key}')
+                circuit['state'] = self.OPEN
+                circuit['opened_at'] = time.monotonic()
+
+    def _circuit(self, key: str) -> dict:
+        if key not in self._circuits:
+            self._circuits[key] = {'state': self.CLOSED, 'failures': 0,
+                                    'opened_at': 0.0}
+        return self._circuits[key]
+
+
 class Paginator(APIBase):
     """
     Custom data structure used to support pagination of data from Graph API
     request responses. It's iterable, so you can iterate over the whole
     collection of returned data Pythonically and it will request more data
-    as the current page runs out. You can also access pages individually and
-    call get_next_page() to manually manage pages.
+    as the current page runs out. It also supports indexing and slicing,
+    fetching only as many pages as are needed to answer the request, and len()
+    when $count was requested or fetch_all() was called. You can
+    also access pages individually and call next_page() to manually manage
+    pages.
+
+    Fetched pages are kept in a bounded LRU cache so the collection can be
+    iterated more than once without going back to Microsoft. Pages evicted from
+    the cache are either re-fetched from their page URL when needed again, or,
+    if spill_to_disk is set, written to a temporary directory and read back
+    from there. Note that objects rebuilt from an evicted page are new objects,
+    so unsaved attribute changes made to them are not kept.
 
     Attributes
         graph_connector(APIConnector): Manages access tokens and makes API calls
@@ -74,6 +518,11 @@ class Paginator(APIBase):
         next_page_url(str): URL to GET for next page of data
         constructor(Any): Constructor to create objects from MS data
         limit(int): Max total data entries to be returned
+        count(int): Total entries on the server as reported by $count, if
+            it was requested
+        headers(dict): Extra headers sent when requesting pages
+        max_cached_pages(int): Max pages held in memory, None for no bound
+        spill_to_disk(bool): Whether evicted pages are written to disk
     """
     def __init__(
         self,
@@ -81,7 +530,11 @@ class Paginator(APIBase):
         data: List,
         next_page_url: str,
         constructor: Any,
-        limit: int = None
+        limit: int = None,
+        count: Optional[int] = None,
+        headers: Optional[dict] = None,
+        max_cached_pages: Optional[int] = DEFAULT_PAGE_CACHE_SIZE,
+        spill_to_disk: bool = False
     ):
         """
         Initializes Paginator object. This is a data structure that supports
@@ -99,80 +552,136 @@ class Paginator(APIBase):
                 Constructor to create objects from MS data
             limit : int
                 Max total data entries to be returned
+            count : Optional[int]
+                Total entries on the server as reported by $count, used by
+                len() to avoid fetching every page
+            headers : Optional[dict]
+                Extra headers to send when requesting pages
+            max_cached_pages : Optional[int]
+                Max pages held in memory at once, None for no bound. The first
+                page is always kept as well
+            spill_to_disk : bool
+                If True, pages evicted from memory are written to a temporary
+                directory instead of being re-fetched from Microsoft
         """
 
         # Super class constructor
         super().__init__()
-        
+
+        if max_cached_pages is not None and max_cached_pages < 1:
+            raise ValueError('max_cached_pages must be at least 1 or None')
+
         self.graph_connector = api_connector
-        self.page = data
-        self._idx = 0
-        self.next_page_url = next_page_url
         self.constructor = constructor
         self.limit = limit
+        self.count = count
+        self.headers = headers
+        self.max_cached_pages = max_cached_pages
+        self.spill_to_disk = spill_to_disk
 
         if limit and limit < len(data): # received more than limit
-            self.curr_data_count = self.total_data_count = limit
-        else:
-            self.curr_data_count = self.total_data_count = len(data)
-    
+            data = data[:limit]
+            next_page_url = None
+
+        # Page bookkeeping, index i describes page i
+        self._page_starts = [0] # index of first entry of each page
+        self._page_sizes = [len(data)]
+        self._page_urls = [None, next_page_url] # URL to GET each page
+
+        # Page cache, first page is never evicted as it has no URL
+        self._pages = OrderedDict()
+        self._pages[0] = (None, data)
+        self._spill_dir = None
+        self._spilled_pages = set()
+
+        # Cursor state for __next__ and next_page()
+        self._page_idx = 0
+        self._idx = 0
+        self.page = data
+        self.next_page_url = next_page_url
+
     def __iter__(self):
-        return self
-    
+        i = 0
+        while True:
+            try:
+                val = self._get_item(i)
+            except IndexError:
+                return
+            yield val
+            i += 1
+
     def __next__(self):
-        # Checking if we can just index data
-        if self._idx < self.curr_data_count:
-            val = self.page[self._idx]
-            self._idx += 1
-            return val
-        elif self.limit and self.limit <= self.total_data_count:
-            raise StopIteration()
-        
-        # Checking if there's more data to fetch
-        if self.next_page_url == None:
-            raise StopIteration()
-        
-        # Fetching next page
-        response = self.graph_connector.get(self.next_page_url)
-        if not response.status_code == HTTPStatus.OK: # Checking for 200
-            logger.error('Error when getting next page from Graph API')
-            logger.error(response.content)
+        try:
+            val = self._get_item(self._idx)
+        except IndexError:
             raise StopIteration()
-        
-        # Get JSON
-        response_data = response.json()
 
-        # Check for next page URL
-        self.next_page_url = response_data.get(NEXT_ODATA, None)
+        self._idx += 1
+        return val
 
-        # Get list of JSON's to be deserialized
-        returned_list = response_data.get(VALUE, [])
+    def __len__(self) -> int:
+        if self._all_pages_fetched():
+            return self._fetched_count()
+
+        if self.count is not None:
+            return min(self.count, self.limit) if self.limit else self.count
+
+        # Fetching every page here would make list() walk the collection twice,
+        # as it asks for the length first
+        raise TypeError('len() of a Paginator needs count=True or a call to '
+                        + 'fetch_all() first')
+
+    def __bool__(self) -> bool:
+        # Without this, truth tests would fall back to __len__ and raise
+        try:
+            self._get_item(0)
+        except IndexError:
+            return False
+        return True
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            start, stop, step = key.start, key.stop, key.step
+            if ((start is not None and start < 0) or (stop is not None and stop < 0)
+                    or (step is not None and step < 0)):
+                # Needs the length to resolve
+                return [self._get_item(i)
+                        for i in range(*key.indices(self._length()))]
+
+            vals = []
+            i = start or 0
+            while stop is None or i < stop:
+                try:
+                    vals.append(self._get_item(i))
+                except IndexError:
+                    break
+                i += step or 1
+            return vals
+
+        if not isinstance(key, int):
+            raise TypeError('Paginator indices must be integers or slices, not'
+                            + f' {type(key).__name__}')
+
+        if key < 0:
+            key += self._length()
+            if key < 0:
+                raise IndexError('Paginator index out of range')
+
+        return self._get_item(key)
+
+    def fetch_all(self) -> int:
+        """
+        Fetches every remaining page from Microsoft, after which len() works
+        without $count
+
+        Returns
+            int:
+                Number of entries in the collection
+        """
+        while self._fetch_next_page():
+            pass
+        return self._fetched_count()
 
-        # Check for callable constructor
-        if callable(self.constructor):
-            self.page = []
-            for item in returned_list:
-                self.page.append(self.constructor(self.graph_connector, item))
-        else:
-            raise StopIteration()
-        
-        returned_list_count = len(self.page)
-        if self.limit and self.limit < len(self.page) + self.total_data_count: # received more than limit 
-            self.next_page_url = None
-            self.curr_data_count = len(self.page) + self.total_data_count - self.limit
-            self.total_data_count += self.curr_data_count
-            returned_list_count = self.curr_data_count
-        
-        if returned_list_count > 0: # cleanup and returning value
-            self.curr_data_count = returned_list_count
-            self.total_data_count += returned_list_count
-            self._idx = 0
-            val = self.page[self._idx]
-            self._idx += 1
-            return val
-        else:
-            raise StopIteration()
-    
     def next_page(self) -> bool:
         """
         Gets the next page of data requested from Microsoft. This will set the
@@ -182,44 +691,220 @@ class Paginator(APIBase):
             bool:
                 Indicates the success of the operation
         """
-        if self.next_page_url == None: # No more pages to get
+        next_idx = self._page_idx + 1
+        if next_idx >= len(self._page_sizes) and not self._fetch_next_page():
+            return False # No more pages to get
+
+        page = self._get_page(next_idx)
+        if not page:
             return False
-        
-        # Fetching next page
-        response = self.graph_connector.get(self.next_page_url)
-        if not response.status_code == HTTPStatus.OK: # Checking for 200
-            logger.error('Error when getting next page from Graph API')
-            logger.error(response.content)
+
+        self._page_idx = next_idx
+        self._idx = self._page_starts[next_idx]
+        self.page = page
+        self.next_page_url = self._page_urls[next_idx + 1]
+        return True
+
+    def _get_item(self, idx: int) -> Any:
+        """
+        Gets a single entry of the collection, fetching pages from Microsoft
+        until it is reached if needed
+
+        Parameters
+            idx : int
+                Non-negative index of the entry
+
+        Returns
+            Any:
+                The entry at that index
+
+        Raises
+            IndexError:
+                Raises if there are fewer than idx + 1 entries
+        """
+        while idx >= self._fetched_count():
+            if not self._fetch_next_page():
+                raise IndexError('Paginator index out of range')
+
+        page_idx = bisect_right(self._page_starts, idx) - 1
+        page = self._get_page(page_idx)
+        if page is None:
+            raise IndexError('Paginator index out of range')
+
+        return page[idx - self._page_starts[page_idx]]
+
+    def _get_page(self, page_idx: int) -> Union[List, None]:
+        """
+        Gets an already fetched page, from the cache if it is there and
+        otherwise from disk or from Microsoft
+
+        Parameters
+            page_idx : int
+                Index of the page
+
+        Returns
+            Union[List, None]:
+                The page's entries, or None if it could not be fetched again
+        """
+        if page_idx in self._pages:
+            self._pages.move_to_end(page_idx)
+            return self._pages[page_idx][1]
+
+        if page_idx in self._spilled_pages:
+            with open(self._spill_path(page_idx), 'r') as file:
+                returned_list = json.load(file)
+        else:
+            response_data = self._request_page(self._page_urls[page_idx])
+            if response_data is None:
+                return None
+            returned_list = response_data.get(VALUE, [])
+
+        page = self._construct_page(returned_list)[:self._page_sizes[page_idx]]
+        self._cache_page(page_idx, returned_list, page)
+        return page
+
+    def _fetch_next_page(self) -> bool:
+        """
+        Requests the page after the last fetched one from Microsoft and adds it
+        to the collection
+
+        Returns
+            bool:
+                Indicates whether a non-empty page was added
+        """
+        page_idx = len(self._page_sizes)
+        url = self._page_urls[page_idx]
+        if url == None: # No more pages to get
             return False
-        
-        # Get JSON
-        response_data = response.json()
 
-        # Check for next page URL
-        self.next_page_url = response_data.get(NEXT_ODATA, None)
+        response_data = self._request_page(url)
+        if response_data is None:
+            self._page_urls[page_idx] = None
+            return False
 
         # Get list of JSON's to be deserialized
         returned_list = response_data.get(VALUE, [])
+        page = self._construct_page(returned_list)
+        next_page_url = response_data.get(NEXT_ODATA, None)
 
-        # Check for callable constructor
-        if callable(self.constructor):
-            self.page = []
-            for item in returned_list:
-                self.page.append(self.constructor(self.graph_connector, item))
-        else:
+        fetched_count = self._fetched_count()
+        if self.limit and self.limit <= len(page) + fetched_count: # reached limit
+            page = page[:self.limit - fetched_count]
+            next_page_url = None
+
+        if not page:
+            self._page_urls[page_idx] = None
             return False
-        
-        returned_list_count = len(self.page)
-        if self.limit and self.limit < len(self.page) + self.total_data_count: # received more than limit 
-            self.next_page_url = None
-            self.curr_data_count = len(self.page) + self.total_data_count - self.limit
-            self.total_data_count += self.curr_data_count
-            returned_list_count = self.curr_data_count
-        
-        if returned_list_count > 0: # cleanup and returning value
-            self.curr_data_count = returned_list_count
-            self.total_data_count += returned_list_count
-            self._idx = 0
-            return True
-        else:
-            return False
\ No newline at end of file
+
+        self._page_starts.append(fetched_count)
+        self._page_sizes.append(len(page))
+        self._page_urls.append(next_page_url)
+        self._cache_page(page_idx, returned_list, page)
+        return True
+
+    def _request_page(self, url: str) -> Union[dict, None]:
+        """
+        Makes the GET request for a page of data
+
+        Parameters
+            url : str
+                URL to GET the page from
+
+        Returns
+            Union[dict, None]:
+                Response JSON if successful, otherwise None
+        """
+        if not callable(self.constructor):
+            logger.error('Paginator constructor is not callable')
+            return None
+
+        response = self.graph_connector.get(url, headers=self.headers)
+        if not response.status_code == HTTPStatus.OK: # Checking for 200
+            logger.error('Error when getting next page from Graph API')
+            logger.error(response.content)
+            return None
+
+        return response.json()
+
+    def _construct_page(self, returned_list: List[dict]) -> List:
+        """
+        Creates objects from a page of MS data with the constructor
+
+        Parameters
+            returned_list : List[dict]
+                JSON's to be deserialized
+
+        Returns
+            List:
+                Constructed objects
+        """
+        return [self.constructor(self.graph_connector, item)
+                for item in returned_list]
+
+    def _cache_page(self, page_idx: int, returned_list: List[dict], page: List):
+        """
+        Adds a page to the cache, evicting the least recently used pages if it
+        is full
+
+        Parameters
+            page_idx : int
+                Index of the page
+            returned_list : List[dict]
+                JSON's the page was constructed from, kept for spilling
+            page : List
+                Constructed objects of the page
+        """
+        self._pages[page_idx] = (returned_list if self.spill_to_disk else None,
+                                page)
+
+        if self.max_cached_pages is None:
+            return
+
+        # First page is kept on top of max_cached_pages
+        while len(self._pages) > self.max_cached_pages + 1:
+            # First page has no URL to fetch it again from, so it stays
+            evict_idx = next((i for i in self._pages if i != 0), None)
+            if evict_idx is None:
+                break
+
+            evicted_list, _ = self._pages.pop(evict_idx)
+            if self.spill_to_disk:
+                self._spill_page(evict_idx, evicted_list)
+
+    def _spill_page(self, page_idx: int, returned_list: List[dict]):
+        """
+        Writes an evicted page's JSON's to the temporary spill directory
+
+        Parameters
+            page_idx : int
+                Index of the page
+            returned_list : List[dict]
+                JSON's the page was constructed from
+        """
+        if self._spill_dir is None:
+            self._spill_dir = TemporaryDirectory(prefix='graphappclient-')
+
+        if page_idx in self._spilled_pages: # already on disk
+            return
+
+        with open(self._spill_path(page_idx), 'w') as file:
+            json.dump(returned_list, file)
+        self._spilled_pages.add(page_idx)
+
+    def _spill_path(self, page_idx: int) -> str:
+        return os.path.join(self._spill_dir.name, f'page_{page_idx}.json')
+
+    def _fetched_count(self) -> int:
+        return self._page_starts[-1] + self._page_sizes[-1]
+
+    def _length(self) -> int:
+        """
+        Length of the collection, from $count if it was requested and otherwise
+        by fetching every page, for negative indexes
+        """
+        if not self._all_pages_fetched() and self.count is None:
+            return self.fetch_all()
+        return len(self)
+
+    def _all_pages_fetched(self) -> bool:
+        return self._page_urls[len(self._page_sizes)] == None
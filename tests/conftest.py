@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Lets the tests import graphappclient from src without installing it
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
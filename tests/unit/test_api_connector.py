@@ -0,0 +1,200 @@
+"""
+APIConnector tests against a fake session, with token acquisition replaced so
+that Microsoft isn't contacted.
+"""
+
+import threading
+import time
+
+import pytest
+
+from graphappclient.api_connector import APIConnector
+from graphappclient.constants import MIN_HEDGE_DELAY, MIN_HEDGE_SAMPLES
+from graphappclient.utils import CircuitBreaker
+from requests import ConnectionError, Response
+
+URL = 'https://graph.microsoft.com/v1.0/users'
+
+
+class FakeResponse(Response):
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """
+    Answers every call with status_code, or with the next queued reply if
+    there is one. Replies are exceptions to raise or (status_code, content,
+    delay) tuples.
+    """
+
+    def __init__(self, status_code=200, replies=()):
+        self.status_code = status_code
+        self.replies = list(replies)
+        self.requests = []
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.requests.append((method, url, kwargs))
+            reply = self.replies.pop(0) if self.replies else (self.status_code, b'{}', 0)
+        if isinstance(reply, Exception):
+            raise reply
+
+        status_code, content, delay = reply
+        time.sleep(delay)
+        response = FakeResponse()
+        response.status_code = status_code
+        response._content = content
+        with self._lock:
+            self.responses.append(response)
+        return response
+
+
+def make_connector(session, **kwargs):
+    connector = APIConnector('client', 'tenant', 'secret', session=session, **kwargs)
+    connector._get_token = lambda: 'token'
+    return connector
+
+
+def test_failure_before_request_does_not_leave_circuit_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0)
+    session = FakeSession(status_code=503)
+    connector = make_connector(session, circuit_breaker=breaker)
+
+    connector.get(URL)
+    assert breaker.state('/users') == CircuitBreaker.OPEN
+
+    # Trial call fails getting the token, before anything is sent
+    connector._get_token = lambda: None
+    try:
+        connector.get(URL)
+    except TypeError:
+        pass
+    assert breaker.state('/users') == CircuitBreaker.OPEN
+
+    # Token source and server recovered
+    connector._get_token = lambda: 'token'
+    session.status_code = 200
+    assert connector.get(URL).status_code == 200
+    assert breaker.state('/users') == CircuitBreaker.CLOSED
+
+
+
+def test_unauthenticated_call_sends_no_token():
+    session = FakeSession()
+    connector = make_connector(session)
+    connector._get_token = lambda: pytest.fail('token requested')
+
+    connector.get('https://download.example/file', authenticate=False)
+    method, url, kwargs = session.requests[-1]
+    assert 'Authorization' not in kwargs['headers']
+
+
+def test_hedge_delay_is_p95_latency():
+    connector = make_connector(FakeSession())
+    assert connector._hedge_delay('/users') is None
+
+    for i in range(100):
+        connector._record_latency('/users', (i + 1) / 100)
+    assert connector._hedge_delay('/users') == pytest.approx(0.96)
+
+    # Never hedging sooner than the minimum delay
+    for i in range(100):
+        connector._record_latency('/groups', 0.001)
+    assert connector._hedge_delay('/groups') == MIN_HEDGE_DELAY
+
+
+def test_slow_get_is_hedged_and_loser_closed():
+    session = FakeSession()
+    connector = make_connector(session, hedge_gets=True)
+    for _ in range(MIN_HEDGE_SAMPLES):
+        connector.get(URL)
+
+    session.replies = [(200, b'slow', 0.5), (200, b'fast', 0)]
+    response = connector.get(URL)
+    assert response.content == b'fast'
+    assert len(session.requests) == MIN_HEDGE_SAMPLES + 2
+
+    # The slower response is closed once it arrives
+    deadline = time.monotonic() + 5
+    while not any(r.content == b'slow' and r.closed for r in session.responses):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert not response.closed
+
+
+def test_fast_get_is_not_hedged():
+    session = FakeSession()
+    connector = make_connector(session, hedge_gets=True)
+    for _ in range(MIN_HEDGE_SAMPLES):
+        connector.get(URL)
+
+    connector.get(URL)
+    assert len(session.requests) == MIN_HEDGE_SAMPLES + 1
+
+
+def test_get_is_not_hedged_without_enough_samples():
+    session = FakeSession(replies=[(200, b'slow', 0.2)])
+    connector = make_connector(session, hedge_gets=True)
+    assert connector.get(URL).content == b'slow'
+    assert len(session.requests) == 1
+
+
+def test_longest_endpoint_timeout_prefix_is_used():
+    session = FakeSession()
+    connector = make_connector(session, timeout=30,
+                               endpoint_timeouts={'/users': 5, '/users/delta': 1})
+    for url, timeout in [(f'{URL}/delta', 1), (f'{URL}/1', 5), (URL, 5),
+                         ('https://graph.microsoft.com/v1.0/groups', 30)]:
+        connector.get(url)
+        assert session.requests[-1][2]['timeout'] == timeout
+
+
+@pytest.mark.parametrize('failure', [(503, b'{}', 0), (429, b'{}', 0),
+                                     ConnectionError('refused')])
+def test_stale_response_is_served_when_get_fails(failure):
+    session = FakeSession(replies=[(200, b'fresh', 0), failure])
+    connector = make_connector(session, serve_stale=True)
+    assert connector.get(URL).content == b'fresh'
+    assert connector.get(URL).content == b'fresh'
+
+
+def test_failure_is_returned_without_stale_response():
+    session = FakeSession(replies=[(200, b'fresh', 0), (503, b'{}', 0)])
+    connector = make_connector(session)
+    connector.get(URL)
+    assert connector.get(URL).status_code == 503
+
+
+def test_open_circuit_serves_stale_without_calling():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=60)
+    session = FakeSession(replies=[(200, b'fresh', 0), (503, b'{}', 0)])
+    connector = make_connector(session, circuit_breaker=breaker, serve_stale=True)
+    connector.get(URL)
+    connector.get(URL)
+    assert breaker.state('/users') == CircuitBreaker.OPEN
+
+    assert connector.get(URL).content == b'fresh'
+    assert len(session.requests) == 2
+
+    # Nothing cached for this URL, so fast-failed with a 503
+    response = connector.get(f'{URL}/1')
+    assert response.status_code == 503
+    assert response.json()['error']['code'] == 'circuitOpen'
+    assert len(session.requests) == 2
+
+
+def test_slow_call_counts_as_failure():
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=0.05)
+    session = FakeSession(replies=[(200, b'{}', 0), (200, b'{}', 0.1)])
+    connector = make_connector(session, circuit_breaker=breaker)
+
+    connector.get(URL)
+    assert breaker.state('/users') == CircuitBreaker.CLOSED
+    assert connector.get(URL).status_code == 200
+    assert breaker.state('/users') == CircuitBreaker.OPEN
@@ -0,0 +1,298 @@
+"""
+DriveItem download tests against a fake connector serving a file through
+short lived download URLs, which can be expired and the file changed while a
+download is running, and UploadSession tests against a fake upload session.
+"""
+
+import os
+import threading
+
+import pytest
+
+from graphappclient.drive import DriveItem, UploadSession
+from graphappclient.resource import CollectionResource
+
+ITEM_URL = 'https://graph.microsoft.com/v1.0/drives/drive1/items/item1'
+DOWNLOAD_URL = 'https://download.example/file?version='
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, content=b'', data=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def iter_content(self, block_size):
+        for i in range(0, len(self.content), block_size):
+            yield self.content[i:i + block_size]
+
+    def close(self):
+        pass
+
+
+class FakeDrive:
+
+    def __init__(self, content, parent_reference=True):
+        self.content = content
+        self.e_tag = '"v1"'
+        self.url_version = 0
+        self.parent_reference = parent_reference
+        self.item_requests = 0
+        self.expire_after_first_get = False
+        self.change_on_next_get = None
+        self.expired_barrier = None
+        self._lock = threading.Lock()
+
+    def item_json(self):
+        item_json = {
+            'id': 'item1',
+            'name': 'file.bin',
+            'size': len(self.content),
+            'eTag': self.e_tag,
+            'file': {},
+            '@microsoft.graph.downloadUrl': f'{DOWNLOAD_URL}{self.url_version}'
+        }
+        if self.parent_reference:
+            item_json['parentReference'] = {'driveId': 'drive1'}
+        return item_json
+
+    def get(self, url, headers=None, stream=False, authenticate=True):
+        if url.startswith(DOWNLOAD_URL):
+            assert not authenticate
+            if int(url[len(DOWNLOAD_URL):]) != self.url_version:
+                # Holds the first requests until they all see the expiry
+                if self.expired_barrier is not None:
+                    try:
+                        self.expired_barrier.wait(timeout=1)
+                    except threading.BrokenBarrierError:
+                        pass
+                return FakeResponse(401)
+            start, end = map(int, headers['Range'][len('bytes='):].split('-'))
+            return FakeResponse(206, self.content[start:end + 1])
+
+        with self._lock:
+            assert url.startswith(ITEM_URL)
+            self.item_requests += 1
+            if self.item_requests > 1 and self.change_on_next_get is not None:
+                self.content, self.change_on_next_get = self.change_on_next_get, None
+                self.e_tag = '"v2"'
+            response = FakeResponse(200, data=self.item_json())
+
+            # Every URL handed out so far stops working
+            if self.expire_after_first_get and self.item_requests == 1:
+                self.url_version += 1
+            return response
+
+
+def make_item(drive):
+    return DriveItem.get(drive, DriveItem.resource_id('drive1', 'item1'))
+
+
+def test_expired_url_is_refreshed_once(tmp_path):
+    content = os.urandom(8 * 1024)
+    drive = FakeDrive(content)
+    drive.expire_after_first_get = True
+    drive.expired_barrier = threading.Barrier(4)
+    item = make_item(drive)
+    drive.item_requests = 0
+    destination = str(tmp_path / 'file.bin')
+
+    assert item.download(destination, chunk_size=1024, max_workers=4)
+    with open(destination, 'rb') as file:
+        assert file.read() == content
+    # One refresh when starting, one when the URL expired for every chunk
+    assert drive.item_requests == 2
+
+
+def test_file_changed_during_download_is_discarded(tmp_path):
+    drive = FakeDrive(b'a' * 8 * 1024)
+    drive.expire_after_first_get = True
+    drive.change_on_next_get = b'b' * 8 * 1024
+    item = make_item(drive)
+    drive.item_requests = 0
+    destination = str(tmp_path / 'file.bin')
+
+    assert not item.download(destination, chunk_size=1024, max_workers=4)
+    assert os.listdir(tmp_path) == []
+
+    # Starts over with the new version when called again
+    assert item.download(destination, chunk_size=1024, max_workers=4)
+    with open(destination, 'rb') as file:
+        assert file.read() == b'b' * 8 * 1024
+
+
+def test_drive_id_kept_without_parent_reference(tmp_path):
+    drive = FakeDrive(b'content', parent_reference=False)
+    item = make_item(drive)
+    assert item.drive_id == 'drive1'
+
+    # Refreshing doesn't lose it either
+    assert item.download(str(tmp_path / 'file.bin'))
+    assert item.drive_id == 'drive1'
+
+
+def test_has_no_collection_methods():
+    assert not issubclass(DriveItem, CollectionResource)
+    assert not hasattr(DriveItem, 'list')
+    assert not hasattr(DriveItem, 'create')
+
+
+UPLOAD_URL = 'https://upload.example/session'
+FRAGMENT = 327680 # 320 KiB
+
+
+class FakeUploadSession:
+    """
+    Upload session receiving chunks of a file. in_order makes it reject chunks
+    that don't start where it expects, as OneDrive for Business does, and
+    statuses are returned instead of handling the next PUTs. hold_first holds
+    the first chunk until another has been handled, so they arrive out of
+    order.
+    """
+
+    def __init__(self, size, received=0, in_order=False, statuses=(),
+                 hold_first=False):
+        self.content = bytearray(size)
+        self.missing = [(received, size - 1)] if received < size else []
+        self.in_order = in_order
+        self.statuses = list(statuses)
+        self.puts = []
+        self.views = []
+        self.status_requests = 0
+        self.other_handled = threading.Event()
+        self.hold_first = hold_first
+        self._lock = threading.Lock()
+
+    def ranges(self):
+        return [f'{start}-{end}' for start, end in self.missing]
+
+    def get(self, url, headers=None, stream=False, authenticate=True):
+        assert url == UPLOAD_URL and not authenticate
+        self.status_requests += 1
+        return FakeResponse(200, data={'expirationDateTime': '2030-01-01T00:00:00Z',
+                                       'nextExpectedRanges': self.ranges()})
+
+    def put(self, url, data=None, headers=None, authenticate=True):
+        assert url == UPLOAD_URL and not authenticate
+        byte_range, size = headers['Content-Range'][len('bytes '):].split('/')
+        start, end = map(int, byte_range.split('-'))
+        assert int(size) == len(self.content) and len(data) == end - start + 1
+        if self.hold_first and start == 0:
+            assert self.other_handled.wait(timeout=5)
+        try:
+            return self._put(start, end, data)
+        finally:
+            if start != 0:
+                self.other_handled.set()
+
+    def _put(self, start, end, data):
+        with self._lock:
+            self.puts.append(start)
+            self.views.append(data)
+            if self.statuses:
+                return FakeResponse(self.statuses.pop(0))
+            if self.in_order and start != self.missing[0][0]:
+                return FakeResponse(416)
+
+            self.content[start:end + 1] = data
+            missing = []
+            for missing_start, missing_end in self.missing:
+                if missing_start < start:
+                    missing.append((missing_start, min(missing_end, start - 1)))
+                if missing_end > end:
+                    missing.append((max(missing_start, end + 1), missing_end))
+            self.missing = missing
+
+            if missing:
+                return FakeResponse(202, data={'nextExpectedRanges': self.ranges()})
+            return FakeResponse(201, data={'id': 'item1', 'name': 'file.bin',
+                                           'size': len(self.content),
+                                           'parentReference': {'driveId': 'drive1'}})
+
+
+def make_source(tmp_path, size):
+    content = os.urandom(size)
+    path = tmp_path / 'file.bin'
+    path.write_bytes(content)
+    return str(path), content
+
+
+def test_upload_resumes_from_next_expected_ranges(tmp_path):
+    source_path, content = make_source(tmp_path, 3 * FRAGMENT + 100)
+    session = FakeUploadSession(len(content), received=FRAGMENT)
+    session.content[:FRAGMENT] = content[:FRAGMENT]
+
+    upload = UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT,
+                           next_expected_ranges=[f'{FRAGMENT}-'])
+    drive_item = upload.upload()
+
+    assert drive_item.id == 'item1' and drive_item.drive_id == 'drive1'
+    assert bytes(session.content) == content
+    assert session.puts == [FRAGMENT, 2 * FRAGMENT, 3 * FRAGMENT]
+    assert session.status_requests == 0
+
+
+def test_upload_sends_released_views_of_the_file(tmp_path):
+    source_path, content = make_source(tmp_path, 2 * FRAGMENT + 1)
+    session = FakeUploadSession(len(content))
+
+    assert UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT).upload()
+    assert bytes(session.content) == content
+    assert session.status_requests == 1
+    # Chunks are slices of the memory map, released once sent
+    for view in session.views:
+        assert isinstance(view, memoryview)
+        with pytest.raises(ValueError):
+            view.tobytes()
+
+
+def test_upload_sends_chunks_concurrently_holding_back_the_last(tmp_path):
+    source_path, content = make_source(tmp_path, 6 * FRAGMENT)
+    session = FakeUploadSession(len(content))
+
+    upload = UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT)
+    assert upload.upload(max_workers=4)
+    assert bytes(session.content) == content
+    assert sorted(session.puts) == [i * FRAGMENT for i in range(6)]
+    assert session.puts[-1] == 5 * FRAGMENT
+
+
+def test_upload_falls_back_to_order_when_chunks_are_rejected(tmp_path):
+    source_path, content = make_source(tmp_path, 6 * FRAGMENT)
+    session = FakeUploadSession(len(content), in_order=True, hold_first=True)
+
+    upload = UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT)
+    assert upload.upload(max_workers=4)
+    assert bytes(session.content) == content
+    # Once at the start and once to find what is left after the rejections
+    assert session.status_requests == 2
+
+
+def test_upload_retries_failed_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    source_path, content = make_source(tmp_path, 2 * FRAGMENT)
+    session = FakeUploadSession(len(content), statuses=[503, 429])
+
+    upload = UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT)
+    assert upload.upload()
+    assert bytes(session.content) == content
+    assert session.puts == [0, 0, 0, FRAGMENT]
+
+
+def test_upload_can_be_resumed_after_failing(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    source_path, content = make_source(tmp_path, 2 * FRAGMENT)
+    session = FakeUploadSession(len(content), statuses=[202, 400])
+
+    upload = UploadSession(session, UPLOAD_URL, source_path, chunk_size=FRAGMENT)
+    assert upload.upload() is None
+
+    # The first chunk was never stored, so it is sent again
+    assert upload.upload()
+    assert bytes(session.content) == content
+    assert session.puts == [0, FRAGMENT, 0, FRAGMENT]
@@ -0,0 +1,144 @@
+"""
+map_pages tests against a fake connector serving raw page bodies, using a
+thread pool so the mapper doesn't need pickling.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import pytest
+
+from graphappclient.utils import _find_next_link, map_pages
+
+PAGE_URL = 'https://graph.microsoft.com/v1.0/users?page='
+EVIL_URL = 'https://attacker.example/steal'
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeConnector:
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(url)
+        if url not in self.pages:
+            return FakeResponse(404, b'{"error": {}}')
+        return FakeResponse(200, self.pages[url])
+
+
+def page(entries, next_link=None, link_first=False):
+    members = [('value', entries)]
+    if next_link is not None:
+        link = ('@odata.nextLink', next_link)
+        members.insert(0 if link_first else 1, link)
+    return json.dumps(dict([('@odata.context', 'ctx')] + members)).encode()
+
+
+def walk(connector, first_url):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return list(map_pages(connector, first_url, lambda e: e['id'],
+                              executor=executor))
+
+
+@pytest.mark.parametrize('link_first', [True, False])
+def test_finds_top_level_link(link_first):
+    content = page([{'id': 1}], f'{PAGE_URL}1', link_first)
+    assert _find_next_link(content) == f'{PAGE_URL}1'
+
+
+def test_no_link_on_last_page():
+    assert _find_next_link(page([{'id': 1}])) is None
+    assert _find_next_link(b'{}') is None
+
+
+def test_ignores_link_inside_entry():
+    decoy = {'id': 1, 'name': f'"@odata.nextLink":"{EVIL_URL}"'}
+    assert _find_next_link(page([decoy])) is None
+    assert _find_next_link(page([{'id': 1, '@odata.nextLink': EVIL_URL}])) is None
+    assert _find_next_link(page([{'id': 1}, EVIL_URL])) is None
+
+
+def test_ignores_link_in_last_entry_string():
+    # The body ends with a string value, but it belongs to an entry
+    content = b'{"value": [{"id": 1, "@odata.nextLink": "' + EVIL_URL.encode() + b'"}]}'
+    assert _find_next_link(content) is None
+
+
+def test_finds_link_between_other_members():
+    content = json.dumps({'value': [], '@odata.nextLink': f'{PAGE_URL}1',
+                          '@odata.count': 5}).encode()
+    assert _find_next_link(content) == f'{PAGE_URL}1'
+
+
+def test_handles_escaped_quotes():
+    content = page([{'id': 1, 'name': 'a \\" b \\\\'}], f'{PAGE_URL}1')
+    assert _find_next_link(content) == f'{PAGE_URL}1'
+
+
+def test_walks_every_page_in_order():
+    connector = FakeConnector({
+        f'{PAGE_URL}0': page([{'id': 0}, {'id': 1}], f'{PAGE_URL}1'),
+        f'{PAGE_URL}1': page([{'id': 2}], f'{PAGE_URL}2', link_first=True),
+        f'{PAGE_URL}2': page([{'id': 3}]),
+    })
+    assert walk(connector, f'{PAGE_URL}0') == [0, 1, 2, 3]
+
+
+def test_refuses_link_outside_graph():
+    connector = FakeConnector({
+        f'{PAGE_URL}0': page([{'id': 0}], EVIL_URL),
+        EVIL_URL: page([{'id': 1}]),
+    })
+    assert walk(connector, f'{PAGE_URL}0') == [0]
+    assert connector.requests == [f'{PAGE_URL}0']
+
+
+def test_refuses_lookalike_host():
+    lookalike = 'https://graph.microsoft.com.attacker.example/v1.0/users'
+    connector = FakeConnector({f'{PAGE_URL}0': page([{'id': 0}], lookalike)})
+    assert walk(connector, f'{PAGE_URL}0') == [0]
+    assert connector.requests == [f'{PAGE_URL}0']
+
+
+def entry_id(entry_json):
+    # Module level so a process pool can unpickle it
+    return entry_json['id']
+
+
+def numbered_pages(total, page_size):
+    pages = {}
+    for page_idx, start in enumerate(range(0, total, page_size)):
+        next_link = f'{PAGE_URL}{page_idx + 1}' if start + page_size < total else None
+        pages[f'{PAGE_URL}{page_idx}'] = page(
+            [{'id': i} for i in range(start, min(start + page_size, total))], next_link)
+    return pages
+
+
+@pytest.mark.parametrize('limit, pages_needed', [(3, 2), (4, 2), (5, 3), (1, 1), (0, 0)])
+def test_fetches_only_pages_limit_needs(limit, pages_needed):
+    connector = FakeConnector(numbered_pages(total=20, page_size=2))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(map_pages(connector, f'{PAGE_URL}0', entry_id, limit=limit,
+                                 max_pending_pages=4, executor=executor))
+    assert results == list(range(limit))
+    assert len(connector.requests) == pages_needed
+
+
+def test_walks_pages_in_process_pool():
+    connector = FakeConnector(numbered_pages(total=25, page_size=4))
+    results = list(map_pages(connector, f'{PAGE_URL}0', entry_id, processes=2))
+    assert results == list(range(25))
+
+    connector = FakeConnector(numbered_pages(total=25, page_size=4))
+    results = list(map_pages(connector, f'{PAGE_URL}0', entry_id, limit=10,
+                             processes=2))
+    assert results == list(range(10))
+    assert len(connector.requests) == 3
@@ -0,0 +1,173 @@
+"""
+MembershipCache tests against a fake connector serving users' groups in pages,
+which can be made to fail, and queued responses to group delta queries.
+"""
+
+from graphappclient.membership import MembershipCache
+
+GRAPH_URL = 'https://graph.microsoft.com/v1.0'
+DELTA_LINK = f'{GRAPH_URL}/groups/delta?$deltatoken='
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+        self.content = str(data).encode()
+
+    def json(self):
+        return self._data
+
+
+class FakeConnector:
+
+    def __init__(self, groups, page_size=3):
+        self.groups = groups # user ID -> group IDs
+        self.page_size = page_size
+        self.fail_pages = set()
+        self.delta_responses = [] # (status, data) for each delta GET
+        self.on_groups_page = None
+        self.requests = []
+        self.delta_requests = []
+
+    def get(self, url, headers=None):
+        if '/groups/delta' in url:
+            self.delta_requests.append(url)
+            status, data = self.delta_responses.pop(0)
+            return FakeResponse(status, data)
+
+        user_id = url.split('/users/')[1].split('/')[0]
+        page_idx = int(url.split('skiptoken=')[1]) if 'skiptoken=' in url else 0
+        self.requests.append(page_idx)
+        if self.on_groups_page is not None:
+            self.on_groups_page()
+        if page_idx in self.fail_pages:
+            return FakeResponse(503, {'error': {}})
+
+        group_ids = self.groups[user_id]
+        start = page_idx * self.page_size
+        data = {'value': [{'id': group_id}
+                          for group_id in group_ids[start:start + self.page_size]]}
+        if start + self.page_size < len(group_ids):
+            data['@odata.nextLink'] = (f'{GRAPH_URL}/users/{user_id}/transitiveMemberOf'
+                                       + f'/microsoft.graph.group?$skiptoken={page_idx + 1}')
+        return FakeResponse(200, data)
+
+
+def delta(groups, next_link=None, token='1'):
+    data = {'value': groups}
+    if next_link:
+        data['@odata.nextLink'] = next_link
+    else:
+        data['@odata.deltaLink'] = f'{DELTA_LINK}{token}'
+    return 200, data
+
+
+def make_cache(connector):
+    # The first refresh only records where changes start from
+    cache = MembershipCache(connector)
+    connector.delta_responses.append(delta([], token='0'))
+    assert cache.refresh()
+    return cache
+
+
+def test_gets_groups_from_every_page():
+    connector = FakeConnector({'user1': [f'group{i}' for i in range(7)]})
+    cache = MembershipCache(connector)
+
+    assert cache.get_groups('user1') == frozenset(f'group{i}' for i in range(7))
+    assert connector.requests == [0, 1, 2]
+    assert cache.is_member('user1', 'group6')
+
+    # Cached, so nothing more is requested
+    assert cache.is_member('user1', 'group0')
+    assert connector.requests == [0, 1, 2]
+
+
+def test_failed_later_page_is_not_cached():
+    connector = FakeConnector({'user1': [f'group{i}' for i in range(7)]})
+    connector.fail_pages.add(2)
+    cache = MembershipCache(connector)
+
+    assert cache.get_groups('user1') is None
+    assert not cache.is_member('user1', 'group0')
+    assert len(cache) == 0
+
+    # Recovered, so every group is fetched again
+    connector.fail_pages.clear()
+    assert cache.is_member('user1', 'group6')
+    assert len(cache) == 1
+
+
+def test_first_refresh_drops_users_cached_before_it():
+    connector = FakeConnector({'user1': ['group1']})
+    cache = MembershipCache(connector)
+    cache.get_groups('user1')
+
+    connector.delta_responses.append(delta([]))
+    assert cache.refresh()
+    assert len(cache) == 0
+    assert connector.delta_requests[0].endswith('&$deltaToken=latest')
+
+
+def test_refresh_drops_users_affected_by_changes():
+    connector = FakeConnector({'user1': ['group1'], 'user2': ['group2'],
+                               'user3': ['group3'], 'user4': ['group4']})
+    cache = make_cache(connector)
+    for user_id in connector.groups:
+        cache.get_groups(user_id)
+
+    # Changes across two pages: a member added to group1, user2 added to a
+    # group not cached, group3 deleted and only group4's name changed
+    connector.delta_responses += [
+        delta([{'id': 'group1', 'members@delta': [{'id': 'user9'}]}],
+              next_link=f'{DELTA_LINK}0&$skiptoken=1'),
+        delta([{'id': 'group8', 'members@delta': [{'id': 'user2', '@removed': {}}]},
+               {'id': 'group3', '@removed': {'reason': 'deleted'}},
+               {'id': 'group4', 'displayName': 'Renamed'}]),
+    ]
+    assert cache.refresh()
+
+    assert connector.delta_requests[1:] == [f'{DELTA_LINK}0', f'{DELTA_LINK}0&$skiptoken=1']
+    assert sorted(cache._users) == ['user4']
+
+
+def test_expired_delta_link_clears_cache_and_starts_again():
+    connector = FakeConnector({'user1': ['group1']})
+    cache = make_cache(connector)
+    cache.get_groups('user1')
+
+    connector.delta_responses += [(410, {'error': {}}), delta([], token='2')]
+    assert cache.refresh()
+    assert len(cache) == 0
+    assert connector.delta_requests[-1].endswith('&$deltaToken=latest')
+    assert cache._delta_link == f'{DELTA_LINK}2'
+
+
+def test_groups_fetched_during_a_change_are_not_cached():
+    connector = FakeConnector({'user1': ['group1']})
+    cache = make_cache(connector)
+
+    # user1 is removed from group1 while their groups are being fetched
+    connector.delta_responses.append(
+        delta([{'id': 'group1', 'members@delta': [{'id': 'user1', '@removed': {}}]}]))
+    connector.on_groups_page = cache.refresh
+    assert cache.get_groups('user1') == frozenset(['group1'])
+    assert len(cache) == 0
+
+    connector.groups['user1'] = []
+    connector.on_groups_page = None
+    assert not cache.is_member('user1', 'group1')
+    assert len(cache) == 1
+
+
+def test_failed_refresh_keeps_cache():
+    connector = FakeConnector({'user1': ['group1']})
+    cache = make_cache(connector)
+    cache.get_groups('user1')
+
+    connector.delta_responses.append((503, {'error': {}}))
+    assert not cache.refresh()
+    assert len(cache) == 1
+    assert cache._delta_link == f'{DELTA_LINK}0'
@@ -0,0 +1,173 @@
+"""
+Paginator tests against a fake connector serving numbered entries in pages,
+counting the pages requested from it.
+"""
+
+import pytest
+
+from graphappclient.utils import Paginator
+
+PAGE_URL = 'https://graph.microsoft.com/v1.0/users?page='
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+        self.content = str(data).encode()
+
+    def json(self):
+        return self._data
+
+
+class FakeConnector:
+
+    def __init__(self, total, page_size, fail_pages=()):
+        self.total = total
+        self.page_size = page_size
+        self.fail_pages = set(fail_pages)
+        self.requests = []
+
+    def page(self, page_idx):
+        start = page_idx * self.page_size
+        data = {'value': [{'id': i} for i in range(start, min(start + self.page_size, self.total))]}
+        if start + self.page_size < self.total:
+            data['@odata.nextLink'] = f'{PAGE_URL}{page_idx + 1}'
+        return data
+
+    def get(self, url, headers=None):
+        page_idx = int(url.split('?page=')[1])
+        self.requests.append(page_idx)
+        if page_idx in self.fail_pages:
+            return FakeResponse(503, {'error': {}})
+        return FakeResponse(200, self.page(page_idx))
+
+
+def entry(api_connector, entry_json):
+    return entry_json['id']
+
+
+def make_paginator(total=100, page_size=10, **kwargs):
+    connector = FakeConnector(total, page_size, kwargs.pop('fail_pages', ()))
+    first = connector.page(0)
+    paginator = Paginator(connector, [entry(connector, e) for e in first['value']],
+                          first.get('@odata.nextLink'), entry, **kwargs)
+    return paginator, connector
+
+
+def test_iterates_every_entry_once():
+    paginator, connector = make_paginator()
+    assert list(paginator) == list(range(100))
+    assert connector.requests == list(range(1, 10))
+
+
+def test_list_does_not_prefetch_for_length():
+    paginator, connector = make_paginator(max_cached_pages=2)
+    assert list(paginator) == list(range(100))
+    assert len(connector.requests) == 9
+
+
+def test_iterates_again_from_cache():
+    paginator, connector = make_paginator()
+    list(paginator)
+    assert list(paginator) == list(range(100))
+    assert len(connector.requests) == 9
+
+
+def test_indexing_fetches_only_needed_pages():
+    paginator, connector = make_paginator()
+    assert paginator[25] == 25
+    assert connector.requests == [1, 2]
+    with pytest.raises(IndexError):
+        paginator[100]
+
+
+def test_negative_index():
+    paginator, connector = make_paginator()
+    assert paginator[-1] == 99
+    assert paginator[-100] == 0
+    with pytest.raises(IndexError):
+        paginator[-101]
+
+
+def test_slicing():
+    paginator, connector = make_paginator()
+    assert paginator[5:15] == list(range(5, 15))
+    assert connector.requests == [1]
+    assert paginator[95:] == list(range(95, 100))
+    assert paginator[:30:7] == list(range(0, 30, 7))
+    assert paginator[-3:] == [97, 98, 99]
+
+
+def test_len_needs_count_or_fetch_all():
+    paginator, connector = make_paginator()
+    with pytest.raises(TypeError):
+        len(paginator)
+    assert connector.requests == []
+    assert paginator.fetch_all() == 100
+    assert len(paginator) == 100
+
+
+def test_len_from_count_without_fetching():
+    paginator, connector = make_paginator(count=100, limit=42)
+    assert len(paginator) == 42
+    assert connector.requests == []
+
+
+def test_limit():
+    paginator, connector = make_paginator(limit=25)
+    assert list(paginator) == list(range(25))
+    assert len(paginator) == 25
+
+
+def test_one_cached_page_fetches_each_page_once_per_walk():
+    paginator, connector = make_paginator(total=410, page_size=10, max_cached_pages=1)
+    assert list(paginator) == list(range(410))
+    assert len(connector.requests) == 40
+
+
+def test_evicted_pages_are_fetched_again():
+    paginator, connector = make_paginator(max_cached_pages=2)
+    list(paginator)
+    assert sorted(paginator._pages) == [0, 8, 9]
+    assert paginator[15] == 15
+    assert connector.requests[-1] == 1
+
+
+def test_evicted_pages_spill_to_disk():
+    paginator, connector = make_paginator(max_cached_pages=2, spill_to_disk=True)
+    list(paginator)
+    requests = len(connector.requests)
+    assert list(paginator) == list(range(100))
+    assert len(connector.requests) == requests
+
+
+def test_failed_page_ends_iteration():
+    paginator, connector = make_paginator(fail_pages=[3])
+    assert list(paginator) == list(range(30))
+
+
+def test_next_page():
+    paginator, connector = make_paginator(total=25)
+    assert paginator.page == list(range(10))
+    assert paginator.next_page()
+    assert paginator.page == list(range(10, 20))
+    assert paginator.next_page()
+    assert paginator.page == list(range(20, 25))
+    assert not paginator.next_page()
+
+
+def test_truth_test_does_not_need_len():
+    paginator, connector = make_paginator()
+    assert paginator
+    assert connector.requests == []
+
+    assert not Paginator(connector, [], None, entry)
+
+
+def test_truth_test_fetches_past_empty_first_page():
+    connector = FakeConnector(total=5, page_size=5)
+    paginator = Paginator(connector, [], f'{PAGE_URL}0', entry)
+    assert paginator
+    assert connector.requests == [0]
@@ -0,0 +1,165 @@
+"""
+GraphClientPool and RateBudget tests. Clients are only created, never used
+to call Microsoft, and time is replaced with a fake clock.
+"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+
+import pytest
+
+from graphappclient.pool import GraphClientPool
+from graphappclient.utils import CircuitBreaker, RateBudget
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('graphappclient.pool.time', clock)
+    monkeypatch.setattr('graphappclient.utils.time', clock)
+    return clock
+
+
+def make_pool(**kwargs):
+    return GraphClientPool('client', 'secret', **kwargs)
+
+
+def test_clients_are_created_on_first_use(clock):
+    pool = make_pool()
+    pool.register_tenant('tenant1')
+    assert pool.active_tenants() == []
+
+    client = pool.get_client('tenant1')
+    assert pool.get_client('tenant1') is client
+    assert client.graph_connector.session is pool.session
+
+    # Unregistered tenants use the pool's credentials
+    pool.get_client('tenant2')
+    assert pool.active_tenants() == ['tenant1', 'tenant2']
+
+
+def test_least_recently_used_client_is_evicted(clock):
+    pool = make_pool(max_active_tenants=2)
+    pool.get_client('tenant1')
+    pool.get_client('tenant2')
+    pool.get_client('tenant1')
+    pool.get_client('tenant3')
+    assert pool.active_tenants() == ['tenant1', 'tenant3']
+
+
+def test_idle_clients_are_evicted(clock):
+    pool = make_pool(idle_timeout=60)
+    client = pool.get_client('tenant1')
+    clock.now += 30
+    pool.get_client('tenant2')
+    clock.now += 40
+    assert pool.active_tenants() == ['tenant2']
+
+    # Still registered, so a new client is created on next use
+    assert pool.get_client('tenant1') is not client
+
+
+def test_registering_again_replaces_client(clock):
+    pool = make_pool()
+    client = pool.get_client('tenant1')
+    pool.register_tenant('tenant1', client_id='other', client_secret='other')
+    assert pool.active_tenants() == []
+    assert pool.get_client('tenant1') is not client
+
+    with pytest.raises(ValueError):
+        GraphClientPool().register_tenant('tenant1')
+
+
+def test_rate_budget_is_kept_across_evictions(clock):
+    pool = make_pool(requests_per_second=5, max_active_tenants=1)
+    budget = pool.get_client('tenant1').graph_connector.rate_budget
+    assert pool.get_client('tenant2').graph_connector.rate_budget is not budget
+    assert pool.active_tenants() == ['tenant2']
+
+    # Rebuilt client for tenant1 draws from the same budget
+    assert pool.get_client('tenant1').graph_connector.rate_budget is budget
+
+
+def test_circuit_breakers_are_per_tenant(clock):
+    pool = make_pool(circuit_breaker_factory=lambda: CircuitBreaker(failure_threshold=1),
+                     max_active_tenants=1)
+    breaker = pool.get_client('tenant1').graph_connector.circuit_breaker
+    breaker.record_failure('/users')
+
+    other = pool.get_client('tenant2').graph_connector.circuit_breaker
+    assert other is not breaker
+    assert other.state('/users') == CircuitBreaker.CLOSED
+    assert pool.get_client('tenant1').graph_connector.circuit_breaker is breaker
+
+
+def test_shared_circuit_breaker_is_rejected():
+    with pytest.raises(ValueError):
+        make_pool(circuit_breaker=CircuitBreaker())
+
+
+def test_connector_options_are_forwarded(clock):
+    pool = make_pool(timeout=7)
+    assert pool.get_client('tenant1').graph_connector.timeout == 7
+
+
+def test_session_rejects_cookies():
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Set-Cookie', 'session=tenant1; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    pool = make_pool()
+    try:
+        response = pool.session.get(f'http://127.0.0.1:{server.server_address[1]}/',
+                                    timeout=5)
+        assert response.headers['Set-Cookie']
+        assert len(pool.session.cookies) == 0
+    finally:
+        thread.join()
+        server.server_close()
+        pool.close()
+
+
+def test_rate_budget_allows_burst_then_paces(clock):
+    budget = RateBudget(rate=4, burst=2)
+    for _ in range(2):
+        budget.acquire()
+    assert clock.slept == []
+
+    budget.acquire()
+    assert clock.slept == [pytest.approx(0.25)]
+
+    # Refills while idle, but never above the burst
+    clock.now += 10
+    clock.slept.clear()
+    for _ in range(3):
+        budget.acquire()
+    assert clock.slept == [pytest.approx(0.25)]
+
+
+def test_rate_budget_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        RateBudget(0)
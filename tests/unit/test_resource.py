@@ -0,0 +1,198 @@
+"""
+Resource creation retry tests against a fake connector, checking that create
+requests that may have been applied aren't blindly sent again.
+"""
+
+import requests
+from requests import ConnectTimeout, ReadTimeout, Response
+
+from graphappclient.resource import CollectionResource
+from graphappclient.user import User
+
+USER = {
+    'accountEnabled': True,
+    'displayName': 'Adele Vance',
+    'mailNickname': 'AdeleV',
+    'userPrincipalName': 'AdeleV@contoso.onmicrosoft.com',
+    'passwordProfile': {'password': 'secret'}
+}
+
+
+def make_response(status_code, data=None):
+    response = Response()
+    response.status_code = status_code
+    response._content = requests.compat.json.dumps(data or {}).encode()
+    return response
+
+
+class FakeConnector:
+    """
+    Directory of users, where each POST raises the next queued error or
+    returns the next queued status if there is one (item_statuses are used for
+    the requests in a batch). apply_before_error makes the POST create the user
+    first, as when Microsoft applied the request but the reply was lost or
+    failed. The first hidden_lookups lookups miss, as when the directory hasn't
+    replicated a new user yet.
+    """
+
+    def __init__(self, errors=(), apply_before_error=True, statuses=(),
+                 item_statuses=(), hidden_lookups=0):
+        self.errors = list(errors)
+        self.apply_before_error = apply_before_error
+        self.statuses = list(statuses)
+        self.item_statuses = list(item_statuses)
+        self.hidden_lookups = hidden_lookups
+        self.users = {}
+        self.posts = 0
+        self.lookups = 0
+
+    def create(self, data):
+        upn = data['userPrincipalName']
+        if upn in self.users:
+            return make_response(400, {'error': {'message': 'already exists'}})
+        self.users[upn] = {**data, 'id': str(len(self.users))}
+        return make_response(201, self.users[upn])
+
+    def post(self, url, json=None):
+        self.posts += 1
+        requests_json = json.get('requests') if url.endswith('/$batch') else None
+        if self.errors:
+            error = self.errors.pop(0)
+            if self.apply_before_error and not isinstance(error, ConnectTimeout):
+                for request in requests_json or [{'body': json}]:
+                    self.create(request['body'])
+            raise error
+        if self.statuses:
+            status = self.statuses.pop(0)
+            if self.apply_before_error and status != 429:
+                for request in requests_json or [{'body': json}]:
+                    self.create(request['body'])
+            return make_response(status, {'error': {'message': 'failed'}})
+
+        if requests_json is None:
+            return self.create(json)
+        responses = []
+        for request in requests_json:
+            response = self.create(request['body'])
+            if self.item_statuses:
+                status = self.item_statuses.pop(0)
+                if status == 429 or not self.apply_before_error:
+                    self.users.pop(request['body']['userPrincipalName'])
+                response = make_response(status, {'error': {'message': 'failed'}})
+            responses.append({'id': request['id'], 'status': response.status_code,
+                              'body': response.json()})
+        return make_response(200, {'responses': responses})
+
+    def get(self, url, headers=None):
+        self.lookups += 1
+        upn = requests.utils.unquote(url.rsplit('/', 1)[1])
+        if self.hidden_lookups:
+            self.hidden_lookups -= 1
+            return make_response(404, {'error': {}})
+        if upn in self.users:
+            return make_response(200, self.users[upn])
+        return make_response(404, {'error': {}})
+
+
+def create(connector, use_batch):
+    return list(User.create_many(connector, [dict(USER)], max_retries=2,
+                                 use_batch=use_batch))
+
+
+def test_read_timeout_after_create_is_reported_as_created(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(errors=[ReadTimeout('read timed out')])
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 1
+        assert len(connector.users) == 1
+
+
+def test_read_timeout_before_create_is_sent_again(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(errors=[ReadTimeout('read timed out')],
+                                  apply_before_error=False)
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 2
+
+
+def test_connect_errors_are_retried(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(errors=[ConnectTimeout('connect timed out')])
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 2
+
+
+def test_server_error_after_create_is_reported_as_created(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(statuses=[504])
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 1
+
+
+def test_server_error_in_batch_after_create_is_reported_as_created(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    connector = FakeConnector(item_statuses=[503])
+    results = create(connector, use_batch=True)
+    assert [r.success for r in results] == [True]
+    assert connector.posts == 1
+
+
+def test_server_error_before_create_is_sent_again(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(statuses=[502], apply_before_error=False)
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 2
+        assert connector.lookups == 1
+
+
+def test_throttled_create_is_sent_again_without_lookup(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(statuses=[429])
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 2
+        assert connector.lookups == 0
+
+    connector = FakeConnector(item_statuses=[429])
+    assert [r.success for r in create(connector, use_batch=True)] == [True]
+    assert connector.posts == 2
+    assert connector.lookups == 0
+
+
+def test_rejected_resend_is_looked_up_again(monkeypatch):
+    # Applied, but the first lookup misses it, so the resend is rejected
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    for use_batch in (False, True):
+        connector = FakeConnector(errors=[ReadTimeout('read timed out')],
+                                  hidden_lookups=1)
+        results = create(connector, use_batch)
+        assert [r.success for r in results] == [True]
+        assert connector.posts == 2
+        assert len(connector.users) == 1
+
+
+def test_error_is_response_text():
+    connector = FakeConnector()
+    create(connector, use_batch=False)
+    results = create(connector, use_batch=False)
+    assert [r.success for r in results] == [False]
+    assert results[0].error == '{"error": {"message": "already exists"}}'
+
+
+def test_refused_connection_is_a_connect_error():
+    try:
+        requests.post('http://127.0.0.1:9', timeout=1)
+    except requests.RequestException as error:
+        assert CollectionResource._is_connect_error(error)
+    assert not CollectionResource._is_connect_error(ReadTimeout('read timed out'))
@@ -0,0 +1,166 @@
+"""
+Tests of the shared Resource and CollectionResource methods, using a minimal
+resource against a fake connector that serves a collection of numbered widgets
+in pages.
+"""
+
+from graphappclient.resource import CollectionResource
+from graphappclient.utils import Paginator
+
+GRAPH_URL = 'https://graph.microsoft.com/v1.0'
+WIDGETS_URL = f'{GRAPH_URL}/widgets'
+
+
+class Widget(CollectionResource):
+
+    _name = 'widget'
+    _plural = 'widgets'
+    _collection = '/widgets'
+    _fields = {'id': 'id', 'name': 'displayName'}
+    _json_attribute = 'widget_json'
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.content = str(data).encode() if data is not None else b''
+
+    def json(self):
+        return self._data
+
+
+class FakeConnector:
+    """
+    Collection of widgets served page_size at a time. update_status is
+    returned for PATCHes, with the updated widget as the body if it is 200,
+    unless return_body is False.
+    """
+
+    def __init__(self, total, page_size=3, update_status=204, return_body=True):
+        self.widgets = {str(i): {'id': str(i), 'displayName': f'Widget {i}'}
+                        for i in range(total)}
+        self.page_size = page_size
+        self.update_status = update_status
+        self.return_body = return_body
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(('GET', url))
+        if url.startswith(f'{WIDGETS_URL}/'):
+            widget_id = url[len(WIDGETS_URL) + 1:].split('?')[0]
+            if widget_id not in self.widgets:
+                return FakeResponse(404, {'error': {}})
+            return FakeResponse(200, self.widgets[widget_id])
+
+        page_idx = int(url.split('page=')[1]) if 'page=' in url else 0
+        widgets = list(self.widgets.values())
+        start = page_idx * self.page_size
+        data = {'value': widgets[start:start + self.page_size]}
+        if start + self.page_size < len(widgets):
+            data['@odata.nextLink'] = f'{WIDGETS_URL}?page={page_idx + 1}'
+        return FakeResponse(200, data)
+
+    def patch(self, url, json=None):
+        self.requests.append(('PATCH', url))
+        widget = self.widgets[url.rsplit('/', 1)[1]]
+        widget.update(json)
+        if self.update_status == 200 and self.return_body:
+            return FakeResponse(200, {**widget, 'version': 2})
+        return FakeResponse(self.update_status)
+
+    def delete(self, url):
+        self.requests.append(('DELETE', url))
+        if self.widgets.pop(url.rsplit('/', 1)[1], None) is None:
+            return FakeResponse(404, {'error': {}})
+        return FakeResponse(204)
+
+
+def test_single_page_is_listed():
+    connector = FakeConnector(total=3)
+    widgets = Widget.list(connector)
+    assert type(widgets) is list
+    assert [w.id for w in widgets] == ['0', '1', '2']
+    assert widgets[1].name == 'Widget 1'
+    assert widgets[1].widget_json == {'id': '1', 'displayName': 'Widget 1'}
+
+
+def test_many_pages_are_paginated():
+    connector = FakeConnector(total=7)
+    widgets = Widget.list(connector, page_size=3)
+    assert isinstance(widgets, Paginator)
+    assert connector.requests == [('GET', f'{WIDGETS_URL}?$top=3')]
+    assert [w.id for w in widgets] == [str(i) for i in range(7)]
+
+
+def test_limit_within_first_page_is_a_list():
+    connector = FakeConnector(total=7)
+    widgets = Widget.list(connector, limit=2)
+    assert type(widgets) is list
+    assert [w.id for w in widgets] == ['0', '1']
+
+
+def test_limit_across_pages_stops_paginating():
+    connector = FakeConnector(total=20)
+    widgets = Widget.list(connector, limit=5)
+    assert isinstance(widgets, Paginator)
+    assert [w.id for w in widgets] == [str(i) for i in range(5)]
+    assert len(connector.requests) == 2
+
+
+def test_failed_list_is_none():
+    connector = FakeConnector(total=3)
+    connector.get = lambda url, headers=None: FakeResponse(503, {'error': {}})
+    assert Widget.list(connector) is None
+
+
+def test_get():
+    connector = FakeConnector(total=3)
+    widget = Widget.get(connector, '1', select=['displayName'])
+    assert widget.id == '1' and widget.name == 'Widget 1'
+    assert widget.graph_connector is connector
+    assert connector.requests == [('GET', f'{WIDGETS_URL}/1?$select=displayName')]
+
+    assert Widget.get(connector, '9') is None
+
+
+def test_update_without_content():
+    connector = FakeConnector(total=3)
+    widget = Widget.get(connector, '1')
+    assert widget.update({'displayName': 'Renamed'})
+    assert connector.requests[-1] == ('PATCH', f'{WIDGETS_URL}/1')
+    # Nothing returned to reload from
+    assert widget.name == 'Widget 1'
+
+
+def test_update_reloads_returned_resource():
+    connector = FakeConnector(total=3, update_status=200)
+    widget = Widget.get(connector, '1')
+    assert widget.update({'displayName': 'Renamed'})
+    assert widget.name == 'Renamed'
+    assert widget.widget_json['version'] == 2
+
+
+def test_update_with_empty_200_is_a_failure():
+    connector = FakeConnector(total=3, update_status=200, return_body=False)
+    widget = Widget.get(connector, '1')
+    assert not widget.update({'displayName': 'Renamed'})
+
+
+def test_failed_update():
+    connector = FakeConnector(total=3, update_status=400)
+    widget = Widget.get(connector, '1')
+    assert not widget.update({'displayName': 'Renamed'})
+    assert widget.name == 'Widget 1'
+
+
+def test_delete():
+    connector = FakeConnector(total=3)
+    widget = Widget.get(connector, '1')
+    assert widget.delete()
+    assert connector.requests[-1] == ('DELETE', f'{WIDGETS_URL}/1')
+    assert '1' not in connector.widgets
+
+    # Already gone
+    assert not widget.delete()
@@ -0,0 +1,239 @@
+"""
+Subscription tests against a local stand-in for Graph, which makes the same
+validation handshake with a running NotificationReceiver that Microsoft makes
+when a subscription is created, and then sends it notifications. Token
+acquisition is replaced so that Microsoft isn't contacted.
+"""
+
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import queue
+import threading
+from urllib.parse import urlparse
+import uuid
+
+import pytest
+import requests
+
+from graphappclient.graphclient import GraphAppClient
+from graphappclient.notifications import NotificationReceiver
+
+GRAPH_HOST = 'https://graph.microsoft.com'
+
+
+class FakeGraph:
+
+    """
+    Serves the subscriptions collection over HTTP on a free local port
+    """
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.requests = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def notify(self, subscription_id, client_state=None, change_type='updated'):
+        """
+        Sends a notification for a subscription the way Microsoft does
+        """
+        subscription = self.subscriptions[subscription_id]
+        notification = {
+            'subscriptionId': subscription_id,
+            'clientState': client_state,
+            'changeType': change_type,
+            'resource': 'Users/1'
+        }
+        return requests.post(subscription['notificationUrl'],
+                             json={'value': [notification]}, timeout=5)
+
+    def create(self, data):
+        # Validation handshake, the receiver must echo the token back
+        token = f'Validation: {uuid.uuid4()}'
+        try:
+            response = requests.post(data['notificationUrl'],
+                                     params={'validationToken': token}, timeout=5)
+        except requests.RequestException:
+            response = None
+        if response is None or response.status_code != 200 or response.text != token:
+            return HTTPStatus.BAD_REQUEST, {'error': {'code': 'ValidationError'}}
+
+        subscription = dict(data, id=str(uuid.uuid4()))
+        self.subscriptions[subscription['id']] = subscription
+        # Microsoft doesn't return the client state
+        return HTTPStatus.CREATED, {k: v for k, v in subscription.items() if k != 'clientState'}
+
+    def _handler_class(self):
+        graph = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                self._handle()
+
+            def do_POST(self):
+                self._handle()
+
+            def do_PATCH(self):
+                self._handle()
+
+            def do_DELETE(self):
+                self._handle()
+
+            def _handle(self):
+                path = urlparse(self.path).path
+                length = int(self.headers.get('Content-Length', 0))
+                data = json.loads(self.rfile.read(length)) if length else None
+                graph.requests.append((self.command, path, data))
+
+                parts = path.split('/')[2:] # after /v1.0
+                if parts[0] != 'subscriptions':
+                    self._respond(HTTPStatus.NOT_FOUND)
+                elif len(parts) == 1 and self.command == 'POST':
+                    self._respond(*graph.create(data))
+                elif len(parts) == 1 and self.command == 'GET':
+                    self._respond(HTTPStatus.OK, {'value': list(graph.subscriptions.values())})
+                elif parts[1] not in graph.subscriptions:
+                    self._respond(HTTPStatus.NOT_FOUND)
+                elif self.command == 'PATCH':
+                    graph.subscriptions[parts[1]].update(data)
+                    self._respond(HTTPStatus.OK, graph.subscriptions[parts[1]])
+                elif self.command == 'DELETE':
+                    del graph.subscriptions[parts[1]]
+                    self._respond(HTTPStatus.NO_CONTENT)
+                else:
+                    self._respond(HTTPStatus.METHOD_NOT_ALLOWED)
+
+            def _respond(self, status, data=None):
+                body = json.dumps(data).encode() if data is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class LocalSession(requests.Session):
+
+    """
+    Sends Graph calls to the stand-in instead of Microsoft
+    """
+
+    def __init__(self, graph_url):
+        super().__init__()
+        self.graph_url = graph_url
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, url.replace(GRAPH_HOST, self.graph_url, 1),
+                               *args, **kwargs)
+
+
+@pytest.fixture
+def graph():
+    with FakeGraph() as graph:
+        yield graph
+
+
+@pytest.fixture
+def client(graph):
+    client = GraphAppClient('client', 'tenant', 'secret', session=LocalSession(graph.url))
+    client.graph_connector._get_token = lambda: 'token'
+    return client
+
+
+@pytest.fixture
+def receiver():
+    with NotificationReceiver(path='/hook', client_state='secret') as receiver:
+        yield receiver
+
+
+def test_create_subscription_passes_validation(graph, client, receiver):
+    subscription = client.create_subscription(receiver.url, client_state='secret')
+
+    assert subscription is not None
+    assert subscription.id in graph.subscriptions
+    assert subscription.client_state == 'secret'
+    assert graph.subscriptions[subscription.id]['clientState'] == 'secret'
+    assert subscription.expiration_date_time > datetime.now(timezone.utc)
+
+
+def test_create_subscription_fails_validation(graph, client, receiver):
+    wrong_path = receiver.url.replace('/hook', '/other')
+    assert client.create_subscription(wrong_path, client_state='secret') is None
+    assert graph.subscriptions == {}
+
+
+def test_renew_and_delete(graph, client, receiver):
+    subscription = client.create_subscription(receiver.url, client_state='secret')
+    expiration = datetime.now(timezone.utc) + timedelta(hours=2)
+
+    assert subscription.renew(expiration)
+    assert abs(subscription.expiration_date_time - expiration) < timedelta(seconds=1)
+    method, path, data = graph.requests[-1]
+    assert (method, path) == ('PATCH', f'/v1.0/subscriptions/{subscription.id}')
+    assert list(data) == ['expirationDateTime']
+
+    assert subscription.delete()
+    assert graph.subscriptions == {}
+    assert not subscription.delete()
+
+
+def test_get_subscriptions(graph, client, receiver):
+    subscription = client.create_subscription(receiver.url, client_state='secret')
+    assert [s.id for s in client.get_subscriptions()] == [subscription.id]
+
+
+def test_dispatches_notifications_with_client_state(graph, client, receiver):
+    subscription = client.create_subscription(receiver.url, client_state='secret')
+    other = client.create_subscription(receiver.url, client_state='secret')
+    received, received_for_subscription = queue.Queue(), queue.Queue()
+    receiver.add_callback(received.put)
+    receiver.add_callback(received_for_subscription.put, subscription.id)
+
+    assert graph.notify(subscription.id, 'secret').status_code == HTTPStatus.ACCEPTED
+    notification = received.get(timeout=5)
+    assert notification['subscriptionId'] == subscription.id
+    assert received_for_subscription.get(timeout=5) == notification
+
+    # Only callbacks for all subscriptions are called for the other one
+    graph.notify(other.id, 'secret')
+    assert received.get(timeout=5)['subscriptionId'] == other.id
+    assert received_for_subscription.empty()
+
+
+def test_rejects_wrong_client_state(graph, client, receiver):
+    subscription = client.create_subscription(receiver.url, client_state='secret')
+    received = queue.Queue()
+    receiver.add_callback(received.put)
+
+    graph.notify(subscription.id, 'forged')
+    graph.notify(subscription.id, None)
+    graph.notify(subscription.id, 'secret', change_type='deleted')
+
+    # Only the notification with the right client state reaches the callback
+    assert received.get(timeout=5)['changeType'] == 'deleted'
+    assert received.empty()
+
+
+def test_receiver_rejects_other_paths(receiver):
+    response = requests.post(receiver.url.replace('/hook', '/other'),
+                             params={'validationToken': 'token'}, timeout=5)
+    assert response.status_code == HTTPStatus.NOT_FOUND